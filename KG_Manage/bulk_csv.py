@@ -0,0 +1,167 @@
+import argparse
+import csv
+import logging
+import os
+import sys
+import uuid
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from KG_Manage.graph_store import FACE_PROPERTIES, RELATIONSHIP_PROPERTIES
+from KG_Manage.import_manager import ImportManager
+
+logger = logging.getLogger(__name__)
+
+
+REPOSITORY_PROPERTIES = ("name", "type", "created_at", "uuid")
+STRUCTURE_PROPERTIES = ("structure_no", "structure_name", "structure_english_name", "content_hash", "uuid")
+
+CSV_FILES = {
+    "repositories": [":ID"] + list(REPOSITORY_PROPERTIES) + [":LABEL"],
+    "structures": [":ID"] + list(STRUCTURE_PROPERTIES) + [":LABEL"],
+    "faces": [":ID"] + list(FACE_PROPERTIES) + ["uuid", ":LABEL"],
+    "has_structure": [":START_ID", ":END_ID", ":TYPE"],
+    "has_face": [":START_ID", ":END_ID", ":TYPE"],
+    "relationships": [":START_ID", ":END_ID", ":TYPE"] + list(RELATIONSHIP_PROPERTIES)
+}
+
+NODE_FILES = ("repositories", "structures", "faces")
+RELATIONSHIP_FILES = ("has_structure", "has_face", "relationships")
+
+
+class BulkCsvWriter:
+
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.counts = {name: 0 for name in CSV_FILES}
+        self._next_id = 0
+        self._files = {}
+        self._writers = {}
+
+    def __enter__(self):
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        for name, header in CSV_FILES.items():
+            f = open(self.path(name), "w", newline="", encoding="utf-8")
+            self._files[name] = f
+            self._writers[name] = csv.writer(f)
+            self._writers[name].writerow(header)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+
+        for f in self._files.values():
+            f.close()
+        return False
+
+    def path(self, name: str) -> str:
+
+        return os.path.join(self.output_dir, f"{name}.csv")
+
+    def add_repository(self, name: str) -> str:
+
+        repository_id = self._new_id("r")
+        props = {
+            "name": name,
+            "type": "Repository",
+            "created_at": datetime.now().isoformat(),
+            "uuid": str(uuid.uuid4())
+        }
+        self._write("repositories", [repository_id] + [props[k] for k in REPOSITORY_PROPERTIES] + ["Repository"])
+        return repository_id
+
+    def add_file(self, path: str, repository_id: Optional[str]) -> int:
+
+        events = ET.iterparse(path, events=("start", "end"))
+        try:
+            _, root = next(events)
+        except ET.ParseError as e:
+            raise Exception(f"XML format error in {path}: {e}")
+
+        if root.tag != "StandardFeatureStructure":
+            raise Exception(f"Unsupported XML format in {path}, the root element is: {root.tag}")
+
+        structures = 0
+        for structure in ImportManager.iter_structures(events, root):
+            self.add_structure(structure, repository_id)
+            structures += 1
+        return structures
+
+    def add_structure(self, structure: Dict[str, Any], repository_id: Optional[str]):
+
+        structure_id = self._new_id("s")
+        props = dict(structure["props"], uuid=str(uuid.uuid4()))
+        self._write("structures", [structure_id] + [props.get(k, "") for k in STRUCTURE_PROPERTIES] +
+                    [";".join(structure["labels"])])
+
+        if repository_id:
+            self._write("has_structure", [repository_id, structure_id, "HAS_STRUCTURE"])
+
+        face_ids = []
+        for face in structure["faces"]:
+            face_id = self._new_id("f")
+            face_ids.append(face_id)
+            self._write("faces", [face_id] + [face[k] for k in FACE_PROPERTIES] + [str(uuid.uuid4()), "Face"])
+            self._write("has_face", [structure_id, face_id, "HAS_FACE"])
+
+        for edge in structure["edges"]:
+            self._write("relationships", [face_ids[edge["source"]], face_ids[edge["target"]], "RELATIONSHIP"] +
+                        [edge["props"][k] for k in RELATIONSHIP_PROPERTIES])
+
+    def import_command(self, database: str = "neo4j") -> str:
+
+        args = [f"--nodes={self.path(name)}" for name in NODE_FILES]
+        args += [f"--relationships={self.path(name)}" for name in RELATIONSHIP_FILES]
+        return f"neo4j-admin database import full {' '.join(args)} {database}"
+
+    def _new_id(self, prefix: str) -> str:
+
+        self._next_id += 1
+        return f"{prefix}{self._next_id}"
+
+    def _write(self, name: str, row: List[Any]):
+
+        self._writers[name].writerow(row)
+        self.counts[name] += 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    parser = argparse.ArgumentParser(
+        prog="python -m KG_Manage.bulk_csv",
+        description="Convert StandardFeatureStructure XML files into CSV files for neo4j-admin database import."
+    )
+    parser.add_argument("files", nargs="+", help="StandardFeatureStructure XML files")
+    parser.add_argument("-o", "--output", required=True, help="Directory for the generated CSV files")
+    parser.add_argument("-r", "--repository",
+                        help="Repository name for all files (default: one Repository per file, named after it)")
+    parser.add_argument("--no-repository", action="store_true", help="Do not create Repository nodes")
+    parser.add_argument("--database", default="neo4j", help="Target database name for the printed import command")
+    args = parser.parse_args(argv)
+
+    with BulkCsvWriter(args.output) as writer:
+        shared_repository_id = None
+        if args.repository and not args.no_repository:
+            shared_repository_id = writer.add_repository(args.repository)
+
+        for path in args.files:
+            repository_id = shared_repository_id
+            if repository_id is None and not args.no_repository:
+                repository_id = writer.add_repository(os.path.splitext(os.path.basename(path))[0])
+
+            structures = writer.add_file(path, repository_id)
+            logger.info(f"Converted {structures} structures from {path}")
+
+    logger.info(
+        f"Wrote {writer.counts['repositories'] + writer.counts['structures'] + writer.counts['faces']} nodes and "
+        f"{writer.counts['has_structure'] + writer.counts['has_face'] + writer.counts['relationships']} "
+        f"relationships to {args.output}")
+    print(writer.import_command(args.database))
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
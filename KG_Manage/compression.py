@@ -0,0 +1,96 @@
+import gzip
+import logging
+import os
+import zipfile
+import zlib
+from typing import List, Any, Iterable, Iterator, Tuple
+
+from config import Config
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+
+ENCODING_MIMETYPES = {"gzip": "application/gzip", "zstd": "application/zstd"}
+ENCODING_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+EXPORT_FILE_FORMATS = {"xml.gz": "gzip", "xml.zst": "zstd"}
+IMPORT_SUFFIXES = (".xml", ".xml.gz", ".xml.zst", ".zip")
+
+
+def available_encodings() -> List[str]:
+
+    return ["zstd", "gzip"] if zstandard is not None else ["gzip"]
+
+
+def is_supported_import(filename: str) -> bool:
+
+    return filename.lower().endswith(IMPORT_SUFFIXES)
+
+
+def compress_chunks(chunks: Iterable[Any], encoding: str) -> Iterator[bytes]:
+
+    if encoding == "gzip":
+        compressor = zlib.compressobj(Config.EXPORT_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    elif encoding == "zstd":
+        if zstandard is None:
+            raise Exception("zstd compression requires the zstandard package")
+        compressor = zstandard.ZstdCompressor(level=Config.EXPORT_ZSTD_LEVEL).compressobj()
+    else:
+        raise Exception(f"Unsupported compression: {encoding}")
+
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    data = compressor.flush()
+    if data:
+        yield data
+
+
+def iter_xml_sources(raw, filename: str) -> Iterator[Tuple[str, Any]]:
+
+    lower = filename.lower()
+    base = os.path.basename(filename)
+
+    if lower.endswith(".zip"):
+        try:
+            archive = zipfile.ZipFile(raw)
+        except zipfile.BadZipFile as e:
+            raise Exception(f"Invalid zip archive: {e}")
+
+        with archive:
+            members = sorted((info for info in archive.infolist()
+                              if not info.is_dir() and info.filename.lower().endswith(".xml")),
+                             key=lambda info: info.filename)
+            if not members:
+                raise Exception("The zip archive contains no XML files")
+            for info in members:
+                with archive.open(info) as member:
+                    yield info.filename, member
+
+    elif lower.endswith(".xml.gz"):
+        with gzip.GzipFile(fileobj=raw, mode="rb") as member:
+            yield base[:-len(".gz")], member
+
+    elif lower.endswith(".xml.zst"):
+        if zstandard is None:
+            raise Exception("zstd import requires the zstandard package")
+        with zstandard.ZstdDecompressor().stream_reader(raw, closefd=False) as member:
+            yield base[:-len(".zst")], member
+
+    else:
+        yield base, raw
+
+
+def resolve_export_format(export_format: str) -> str:
+
+    encoding = EXPORT_FILE_FORMATS.get((export_format or "").lower())
+    if encoding is None:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    if encoding not in available_encodings():
+        raise ValueError(f"Export format {export_format} requires the zstandard package")
+    return encoding
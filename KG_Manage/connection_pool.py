@@ -0,0 +1,217 @@
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from py2neo import Graph
+from py2neo.errors import ConnectionBroken, ConnectionUnavailable, ServiceUnavailable
+
+logger = logging.getLogger(__name__)
+
+
+def is_transient_error(error: Exception) -> bool:
+
+    if isinstance(error, (ConnectionUnavailable, ConnectionBroken, ServiceUnavailable)):
+        return True
+    if getattr(error, "classification", None) == "TransientError":
+        return True
+    return str(getattr(error, "code", "") or "").startswith("Neo.TransientError")
+
+
+class PooledCursor:
+
+
+    _cursor = None
+    _release = None
+
+    def __init__(self, cursor, release: Callable[[], None]):
+        self._cursor = cursor
+        self._release = release
+
+    def __iter__(self) -> Iterator[Any]:
+
+        try:
+            yield from self._cursor
+        finally:
+            self.close()
+
+    def __getattr__(self, name: str) -> Any:
+
+        if self._cursor is None:
+            raise AttributeError(name)
+        return getattr(self._cursor, name)
+
+    def data(self, *keys) -> List[Dict[str, Any]]:
+
+        try:
+            return self._cursor.data(*keys)
+        finally:
+            self.close()
+
+    def evaluate(self, field: Any = 0) -> Any:
+
+        try:
+            return self._cursor.evaluate(field)
+        finally:
+            self.close()
+
+    def close(self):
+
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+    def __del__(self):
+
+        self.close()
+
+
+class ConnectionPool:
+
+
+    def __init__(self, uri: str, auth, max_size: int = 20, acquire_timeout: float = 30.0,
+                 max_retries: int = 3, retry_backoff: float = 0.2, health_check_interval: float = 30.0):
+        self.uri = uri
+        self.auth = auth
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.health_check_interval = health_check_interval
+
+        self._graph = None
+        self._lock = threading.RLock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._last_checked = 0.0
+
+    def __bool__(self) -> bool:
+
+        return self._graph is not None
+
+    def connect(self) -> bool:
+
+        with self._lock:
+            try:
+                graph = Graph(self.uri, auth=self.auth, max_size=self.max_size)
+                graph.run("RETURN 1").evaluate()
+                self._graph = graph
+                self._last_checked = time.monotonic()
+                return True
+            except Exception:
+                self._graph = None
+                raise
+
+    def close(self):
+
+        with self._lock:
+            graph, self._graph = self._graph, None
+            if graph is not None:
+                try:
+                    graph.service.connector.close()
+                except Exception as e:
+                    logger.warning(f"Failed to close Neo4j connections: {e}")
+
+
+    @contextmanager
+    def checkout(self):
+
+        graph = self._acquire()
+        try:
+            yield graph
+        finally:
+            self._slots.release()
+
+    def _acquire(self) -> Graph:
+
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise Exception(f"Timed out waiting for a database connection after {self.acquire_timeout}s")
+
+        try:
+            return self._healthy_graph()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _healthy_graph(self) -> Graph:
+
+        graph = self._graph
+        if graph is None:
+            raise Exception("Database not connected")
+
+        if time.monotonic() - self._last_checked < self.health_check_interval:
+            return graph
+
+        try:
+            graph.run("RETURN 1").evaluate()
+            self._last_checked = time.monotonic()
+            return graph
+        except Exception as e:
+            if not is_transient_error(e):
+                raise
+            logger.warning(f"Health check failed, reconnecting to Neo4j: {e}")
+            with self._lock:
+                if self._graph is graph:
+                    self.close()
+                    self.connect()
+            return self._graph
+
+    def _with_retry(self, work: Callable[[Graph], Any], max_retries: Optional[int] = None,
+                    hold_slot: bool = False) -> Any:
+
+        max_retries = self.max_retries if max_retries is None else max_retries
+        attempt = 0
+        while True:
+            try:
+                if not hold_slot:
+                    with self.checkout() as graph:
+                        return work(graph)
+
+                graph = self._acquire()
+                try:
+                    return PooledCursor(work(graph), self._slots.release)
+                except BaseException:
+                    self._slots.release()
+                    raise
+            except Exception as e:
+                if not is_transient_error(e):
+                    raise
+                self._last_checked = 0.0
+                attempt += 1
+                if attempt > max_retries:
+                    raise
+                delay = self.retry_backoff * (2 ** (attempt - 1)) * (1 + random.random())
+                logger.warning(f"Transient database error ({e}), retry {attempt}/{max_retries} in {delay:.2f}s")
+                time.sleep(delay)
+
+
+    def run(self, query: str, parameters: Optional[dict] = None, **kwparameters) -> PooledCursor:
+
+        return self._with_retry(lambda graph: graph.run(query, parameters, **kwparameters), max_retries=0,
+                                hold_slot=True)
+
+    def evaluate(self, query: str, parameters: Optional[dict] = None, **kwparameters):
+
+        return self._with_retry(lambda graph: graph.run(query, parameters, **kwparameters).evaluate(), max_retries=0)
+
+    def query(self, query: str, parameters: Optional[dict] = None, **kwparameters) -> PooledCursor:
+
+        return self._with_retry(lambda graph: graph.run(query, parameters, **kwparameters), hold_slot=True)
+
+    def run_in_transaction(self, work: Callable[[Any], Any]) -> Any:
+
+        def unit_of_work(graph):
+            tx = graph.begin()
+            try:
+                result = work(tx)
+                graph.commit(tx)
+                return result
+            except Exception:
+                try:
+                    graph.rollback(tx)
+                except Exception as e:
+                    logger.warning(f"Transaction rollback failed: {e}")
+                raise
+
+        return self._with_retry(unit_of_work)
@@ -1,29 +1,255 @@
+import base64
+import binascii
+import bisect
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+import uuid
+from typing import List, Dict, Any, Optional, Set
+
+from KG_Manage.graph_store import GraphStore
+from KG_Manage.search_index import SearchIndex
+from KG_Manage.structure_overview import StructureOverview
 
 logger = logging.getLogger(__name__)
 
 
+LABEL_CATEGORIES = (
+    ("Step Labels", ("step", "Step")),
+    ("Hole Labels", ("hole", "Hole")),
+    ("Slot Labels", ("slot", "Slot")),
+    ("Pocket Labels", ("pocket", "Pocket")),
+    ("Passage Labels", ("passage", "Passage"))
+)
+
+_LABEL_CATEGORY_CACHE = {}
+
+
 class DataLoader:
 
 
     def __init__(self, graph):
         self.graph = graph
-        self.nodes = []
-        self.rels = []
+        self.store = GraphStore()
+        self.overview = StructureOverview(self.store)
+        self.search_index = SearchIndex()
+
+
+        self.version = 0
+        self._epoch = uuid.uuid4().hex[:8]
+        self._stale = True
+        self._lock = threading.RLock()
+        self._page_orders = {}
+        self._label_catalog = {}
+        self._label_catalog_version = 0
+        self._repository_versions = {}
+        self._repository_base_version = 0
+
+    def bump_version(self) -> int:
+
+        with self._lock:
+            self.version += 1
+            return self.version
+
+    def invalidate(self):
+
+        with self._lock:
+            self._stale = True
+            self.bump_version()
+            self._reset_repository_versions()
+
+    def ensure_loaded(self) -> bool:
+
+        with self._lock:
+            if not self._stale:
+                return True
+            return self.reload_db()
+
+    def get_graph_etag(self) -> str:
+
+        return f"{self._epoch}-{self.version}"
+
+    def get_export_version(self, repository_id: Optional[str] = None) -> Optional[str]:
+
+        with self._lock:
+            if self._stale:
+                return None
+            if repository_id is None:
+                return self.get_graph_etag()
+            version = max(self._repository_versions.get(repository_id, 0), self._repository_base_version)
+            return f"{self._epoch}-r{version}"
+
+    def _repositories_for_node(self, node_id: str, include_neighbors: bool = False) -> Set[str]:
+
+        repositories = set()
+        record = self.store.get_node_record(node_id)
+        if record is not None and "Repository" in record.labels:
+            repositories.add(node_id)
+        for structure_id in self.overview.structures_for_node(node_id, include_neighbors=include_neighbors):
+            for has_structure in self.store.incoming_records(structure_id, "HAS_STRUCTURE"):
+                repositories.add(has_structure.source)
+        return repositories
+
+    def _touch_repositories(self, repository_ids: Set[str]):
+
+        for repository_id in repository_ids:
+            self._repository_versions[repository_id] = self.version
+
+    def _reset_repository_versions(self):
+
+        self._repository_versions.clear()
+        self._repository_base_version = self.version
+
+    @property
+    def nodes(self):
+
+        return self.store.nodes
+
+    @property
+    def rels(self):
+
+        return self.store.rels
+
+    def get_node(self, node_id: str) -> Optional[Dict[str, Any]]:
+
+        return self.store.get_node(node_id)
+
+    def get_rel(self, rel_id: str) -> Optional[Dict[str, Any]]:
+
+        return self.store.get_rel(rel_id)
+
+    def add_node(self, node: Dict[str, Any]) -> Dict[str, Any]:
+
+        with self._lock:
+            if any(not self.store.label_members(label) for label in node["labels"]):
+                self.invalidate_label_catalog()
+            self.store.add_node(node)
+            self.search_index.add(node["id"], node["labels"], node["properties"])
+            self.bump_version()
+            return node
+
+    def update_node(self, node_id: str, labels: List[str], properties: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+
+        with self._lock:
+            previous = self.store.get_node_record(node_id)
+            if previous is not None and set(previous.labels) != set(labels):
+                self.invalidate_label_catalog()
+            if previous is not None and properties.get("uuid") is None and previous.get("uuid") is not None:
+                properties = dict(properties, uuid=previous.get("uuid"))
+            touched = self._repositories_for_node(node_id, include_neighbors=True)
+            node = self.store.update_node(node_id, labels, properties)
+            if node is not None:
+                self.search_index.add(node_id, node["labels"], node["properties"])
+            self.overview.invalidate(self.overview.structures_for_node(node_id))
+            self.bump_version()
+            self._touch_repositories(touched)
+            return node
+
+    def remove_node(self, node_id: str) -> List[str]:
+
+        with self._lock:
+            affected = self.overview.structures_for_node(node_id, include_neighbors=True)
+            touched = self._repositories_for_node(node_id, include_neighbors=True)
+            previous = self.store.get_node_record(node_id)
+            if previous is not None and (
+                    any(len(self.store.label_members(label)) == 1 for label in previous.labels) or
+                    self.store.incoming_records(node_id, "HAS_STRUCTURE")):
+                self.invalidate_label_catalog()
+            removed_rels = self.store.remove_node(node_id)
+            self.overview.on_node_removed(node_id, affected)
+            self.search_index.remove(node_id)
+            self.bump_version()
+            self._touch_repositories(touched)
+            return removed_rels
+
+    def add_rel(self, rel: Dict[str, Any]) -> Dict[str, Any]:
+
+        with self._lock:
+            self.store.add_rel(rel)
+            if rel["type"] == "HAS_STRUCTURE":
+                self.invalidate_label_catalog()
+            self.overview.on_rel_added(self.store.get_rel_record(rel["id"]))
+            self.bump_version()
+            self._touch_repositories(
+                self._repositories_for_node(rel["source"]) | self._repositories_for_node(rel["target"]))
+            return rel
+
+    def remove_rel(self, rel_id: str) -> Optional[Dict[str, Any]]:
+
+        with self._lock:
+            record = self.store.get_rel_record(rel_id)
+            touched = set()
+            if record is not None:
+                touched = self._repositories_for_node(record.source) | self._repositories_for_node(record.target)
+            rel = self.store.remove_rel(rel_id)
+            if record is not None:
+                self.overview.on_rel_removed(record)
+                if record.type == "HAS_STRUCTURE":
+                    self.invalidate_label_catalog()
+            self.bump_version()
+            self._touch_repositories(touched)
+            return rel
+
+    def apply_delta(self, delta: Optional[Dict[str, Any]]) -> bool:
+
+        if delta is None:
+            return self.reload_db()
+
+        with self._lock:
+            if self._stale:
+                return True
+
+            touched = set()
+            endpoints = set()
+            try:
+                for node_id in delta.get("removed_node_ids", ()):
+                    affected = self.overview.structures_for_node(node_id, include_neighbors=True)
+                    touched |= self._repositories_for_node(node_id, include_neighbors=True)
+                    self.store.remove_node(node_id)
+                    self.overview.on_node_removed(node_id, affected)
+                    self.search_index.remove(node_id)
+
+                for node in delta.get("nodes", ()):
+                    self.store.add_node(node)
+                    self.search_index.add(node["id"], node["labels"], node["properties"])
+
+                for rel in delta.get("relationships", ()):
+                    self.store.add_rel(rel)
+                    self.overview.on_rel_added(self.store.get_rel_record(rel["id"]))
+                    endpoints.add(rel["source"])
+                    endpoints.add(rel["target"])
+
+                for node_id in endpoints:
+                    touched |= self._repositories_for_node(node_id)
+            except Exception as e:
+                logger.error(f"Failed to apply import delta, reloading: {e}")
+                return self._reload_db()
+
+            self.invalidate_label_catalog()
+            self.bump_version()
+            self._touch_repositories(touched)
+
+            logger.info(
+                f"Applied import delta: {len(delta.get('nodes', ()))} nodes, "
+                f"{len(delta.get('relationships', ()))} relationships, "
+                f"{len(delta.get('removed_node_ids', ()))} removed nodes")
+            return True
 
     def reload_db(self):
 
         if not self.graph:
             return False
 
+        with self._lock:
+            return self._reload_db()
+
+    def _reload_db(self):
+
         try:
-            self.nodes.clear()
-            self.rels.clear()
+            self.store.clear()
 
 
             node_query = "MATCH (n) RETURN elementId(n) AS id, labels(n) AS labels, properties(n) AS props"
-            node_cursor = self.graph.run(node_query)
+            node_cursor = self.graph.query(node_query)
 
             for record in node_cursor:
                 node_data = {
@@ -31,7 +257,7 @@ class DataLoader:
                     "labels": list(record["labels"]),
                     "properties": dict(record["props"] or {})
                 }
-                self.nodes.append(node_data)
+                self.store.add_node(node_data)
 
 
             rel_query = """
@@ -39,7 +265,7 @@ class DataLoader:
             RETURN elementId(r) AS rid, elementId(a) AS source, elementId(b) AS target, 
                    type(r) AS type, properties(r) AS props
             """
-            rel_cursor = self.graph.run(rel_query)
+            rel_cursor = self.graph.query(rel_query)
 
             for record in rel_cursor:
                 rel_data = {
@@ -49,7 +275,14 @@ class DataLoader:
                     "type": record["type"],
                     "properties": dict(record["props"] or {})
                 }
-                self.rels.append(rel_data)
+                self.store.add_rel(rel_data)
+
+            self.overview.rebuild()
+            self._rebuild_search_index()
+            self.invalidate_label_catalog()
+            self._stale = False
+            self.bump_version()
+            self._reset_repository_versions()
 
             logger.info(f"Loaded {len(self.nodes)} nodes and {len(self.rels)} relationships")
             return True
@@ -60,10 +293,130 @@ class DataLoader:
 
     def get_graph_data(self):
 
-        return {
-            "nodes": self.nodes,
-            "relationships": self.rels
-        }
+        with self._lock:
+            return {
+                "nodes": list(self.nodes),
+                "relationships": list(self.rels)
+            }
+
+    def _rebuild_search_index(self):
+
+        self.search_index.clear()
+        for node_id in self.store.node_ids():
+            record = self.store.get_node_record(node_id)
+            self.search_index.add(record.id, record.labels, record.properties)
+
+    def search_nodes(self, query: str, limit: int = 10, labels: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+
+        with self._lock:
+            candidates = None
+            if labels and len(labels) == 1:
+                candidates = self.store.label_members(labels[0])
+            elif labels:
+                candidates = set()
+                for label in labels:
+                    candidates.update(self.store.label_members(label))
+
+            results = []
+            for node_id, score in self.search_index.search(query, limit, candidates):
+                node = self.store.get_node(node_id)
+                if node is not None:
+                    node["score"] = score
+                    results.append(node)
+            return results
+
+    def get_structure_overview(self, repository_id: Optional[str] = None) -> Dict[str, Any]:
+
+        with self._lock:
+            return self.overview.get_overview(repository_id)
+
+    def get_structure_detail(self, structure_id: str) -> Optional[Dict[str, Any]]:
+
+        with self._lock:
+            return self.overview.get_structure_detail(structure_id)
+
+    def get_graph_page(self, limit: int, cursor: Optional[str] = None, label: Optional[str] = None,
+                       repository_id: Optional[str] = None, cumulative: bool = False) -> Dict[str, Any]:
+
+        with self._lock:
+            ordered_ids, positions = self._get_page_order(label, repository_id)
+
+            start = 0
+            if cursor:
+                start = bisect.bisect_right(ordered_ids, self._decode_cursor(cursor))
+
+            window = ordered_ids[start:start + limit]
+            window_ids = set(window)
+
+            nodes = [self.store.get_node(node_id) for node_id in window]
+            relationships = []
+            for node_id in window:
+                for rel in self.store.outgoing_records(node_id):
+                    if rel.target in window_ids or (cumulative and positions.get(rel.target, start) < start):
+                        relationships.append(rel.to_dict())
+                if cumulative:
+                    for rel in self.store.incoming_records(node_id):
+                        if positions.get(rel.source, start) < start:
+                            relationships.append(rel.to_dict())
+
+            has_more = start + len(window) < len(ordered_ids)
+            return {
+                "nodes": nodes,
+                "relationships": relationships,
+                "next_cursor": self._encode_cursor(window[-1]) if window and has_more else None,
+                "has_more": has_more,
+                "total": len(ordered_ids)
+            }
+
+    def _get_page_order(self, label: Optional[str], repository_id: Optional[str]):
+
+        key = (label, repository_id)
+        cached = self._page_orders.get(key)
+        if cached and cached[0] == self.version:
+            return cached[1], cached[2]
+
+        if repository_id:
+            node_ids = self._get_repository_node_ids(repository_id)
+            if label:
+                node_ids = [node_id for node_id in node_ids
+                            if label in self.store.get_node_record(node_id).labels]
+        elif label:
+            node_ids = self.store.node_ids_by_label(label)
+        else:
+            node_ids = self.store.node_ids()
+
+        ordered_ids = sorted(node_ids)
+        positions = {node_id: index for index, node_id in enumerate(ordered_ids)}
+
+        if len(self._page_orders) >= 16:
+            self._page_orders.clear()
+        self._page_orders[key] = (self.version, ordered_ids, positions)
+        return ordered_ids, positions
+
+    def _get_repository_node_ids(self, repository_id: str) -> List[str]:
+
+        if not self.store.has_node(repository_id):
+            return []
+
+        node_ids = {repository_id}
+        for has_structure in self.store.outgoing_records(repository_id, "HAS_STRUCTURE"):
+            node_ids.add(has_structure.target)
+            for has_face in self.store.outgoing_records(has_structure.target, "HAS_FACE"):
+                node_ids.add(has_face.target)
+        return [node_id for node_id in node_ids if self.store.has_node(node_id)]
+
+    @staticmethod
+    def _encode_cursor(node_id: str) -> str:
+
+        return base64.urlsafe_b64encode(node_id.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> str:
+
+        try:
+            return base64.b64decode(cursor.encode("ascii"), altchars=b"-_", validate=True).decode("utf-8")
+        except (binascii.Error, UnicodeError, ValueError):
+            raise ValueError(f"Invalid cursor: {cursor}")
 
     def get_nodes_by_label(self, label: str) -> List[Dict[str, Any]]:
 
@@ -73,7 +426,7 @@ class DataLoader:
         """
 
         nodes = []
-        cursor = self.graph.run(query)
+        cursor = self.graph.query(query)
         for record in cursor:
             nodes.append({
                 "id": record["id"],
@@ -92,7 +445,7 @@ class DataLoader:
         """
 
         faces = []
-        cursor = self.graph.run(query, structure_id=structure_id)
+        cursor = self.graph.query(query, structure_id=structure_id)
         for record in cursor:
             faces.append({
                 "id": record["id"],
@@ -106,16 +459,15 @@ class DataLoader:
         if not face_ids:
             return []
 
-        face_ids_str = "', '".join(face_ids)
-        query = f"""
+        query = """
         MATCH (a:Face)-[r:RELATIONSHIP]->(b:Face)
-        WHERE elementId(a) IN ['{face_ids_str}'] AND elementId(b) IN ['{face_ids_str}']
+        WHERE elementId(a) IN $face_ids AND elementId(b) IN $face_ids
         RETURN elementId(r) AS rid, elementId(a) AS source, elementId(b) AS target,
                type(r) AS type, properties(r) AS props
         """
 
         relationships = []
-        cursor = self.graph.run(query)
+        cursor = self.graph.query(query, face_ids=list(face_ids))
         for record in cursor:
             relationships.append({
                 "id": record["rid"],
@@ -132,52 +484,63 @@ class DataLoader:
             return {}
 
         try:
+            with self._lock:
+                cached = self._label_catalog.get(None)
+                if cached is not None and cached[0] == self._label_catalog_version:
+                    return self._copy_catalog(cached[1])
+
+                if self._stale:
+                    query = "MATCH (n) RETURN DISTINCT labels(n) AS labels"
+                    cursor = self.graph.query(query)
+
+                    all_labels = set()
+                    for record in cursor:
+                        labels = record["labels"]
+                        if labels:
+                            all_labels.update(labels)
+                    return self._categorize_labels(all_labels)
+
+                catalog = self._categorize_labels(self.store.labels())
+                self._label_catalog[None] = (self._label_catalog_version, catalog)
+                return self._copy_catalog(catalog)
 
-            query = "MATCH (n) RETURN DISTINCT labels(n) AS labels"
-            cursor = self.graph.run(query)
+        except Exception as e:
+            logger.error(f"Failed to get label: {e}")
+            return {}
 
-            all_labels = set()
-            for record in cursor:
-                labels = record["labels"]
-                if labels:
-                    all_labels.update(labels)
-
-
-            categorized_labels = {
-                "Step Labels": [],
-                "Hole Labels": [],
-                "Slot Labels": [],
-                "Pocket Labels": [],
-                "Passage Labels": [],
-                "Other Labels": []
-            }
+    def invalidate_label_catalog(self):
 
+        with self._lock:
+            self._label_catalog_version += 1
+            self._label_catalog.clear()
 
-            step_keywords = ["step", "Step"]
-            hole_keywords = ["hole", "Hole"]
-            slot_keywords = ["slot", "Slot"]
-            pocket_keywords = ["pocket", "Pocket"]
-            passage_keywords = ["passage", "Passage"]
-
-            for label in sorted(all_labels):
-                if any(keyword in label for keyword in step_keywords):
-                    categorized_labels["Step Labels"].append(label)
-                elif any(keyword in label for keyword in hole_keywords):
-                    categorized_labels["Hole Labels"].append(label)
-                elif any(keyword in label for keyword in slot_keywords):
-                    categorized_labels["Slot Labels"].append(label)
-                elif any(keyword in label for keyword in pocket_keywords):
-                    categorized_labels["Pocket Labels"].append(label)
-                elif any(keyword in label for keyword in passage_keywords):
-                    categorized_labels["Passage Labels"].append(label)
-                else:
-                    categorized_labels["Other Labels"].append(label)
-
-            return categorized_labels
+    @staticmethod
+    def _categorize_label(label: str) -> str:
 
-        except Exception as e:
-            logger.error(f"Failed to get label: {e}")
-            return {}
+        category = _LABEL_CATEGORY_CACHE.get(label)
+        if category is None:
+            category = "Other Labels"
+            for name, keywords in LABEL_CATEGORIES:
+                if any(keyword in label for keyword in keywords):
+                    category = name
+                    break
+            _LABEL_CATEGORY_CACHE[label] = category
+        return category
+
+    def _categorize_labels(self, labels) -> Dict[str, List[str]]:
+
+        categorized_labels = {name: [] for name, _ in LABEL_CATEGORIES}
+        categorized_labels["Other Labels"] = []
+
+        for label in sorted(labels):
+            categorized_labels[self._categorize_label(label)].append(label)
+
+        return categorized_labels
+
+    @staticmethod
+    def _copy_catalog(catalog: Dict[str, List[str]]) -> Dict[str, List[str]]:
+
+        return {name: list(labels) for name, labels in catalog.items()}
 
     def debug_nodes(self) -> Dict[str, Any]:
 
@@ -192,7 +555,7 @@ class DataLoader:
             LIMIT 10
             """
 
-            cursor = self.graph.run(query)
+            cursor = self.graph.query(query)
             results = []
 
             for record in cursor:
@@ -225,7 +588,7 @@ class DataLoader:
             RETURN elementId(r) AS id, r.name AS name, properties(r) AS props
             ORDER BY r.name
             """
-            cursor = self.graph.run(query)
+            cursor = self.graph.query(query)
             repositories = []
 
             for record in cursor:
@@ -248,51 +611,35 @@ class DataLoader:
             return {}
 
         try:
-            query = """
-            MATCH (r:Repository)-[:HAS_STRUCTURE]->(s)
-            WHERE elementId(r) = $repository_id
-            RETURN DISTINCT labels(s) AS labels
-            """
-            cursor = self.graph.run(query, repository_id=repository_id)
-
-            all_labels = set()
-            for record in cursor:
-                labels = record["labels"]
-                if labels:
-                    all_labels.update(labels)
-
-
-            categorized_labels = {
-                "Step Labels": [],
-                "Hole Labels": [],
-                "Slot Labels": [],
-                "Pocket Labels": [],
-                "Passage Labels": [],
-                "Other Labels": []
-            }
-
-            step_keywords = ["step", "Step"]
-            hole_keywords = ["hole", "Hole"]
-            slot_keywords = ["slot", "Slot"]
-            pocket_keywords = ["pocket", "Pocket"]
-            passage_keywords = ["passage", "Passage"]
-
-            for label in sorted(all_labels):
-                if any(keyword in label for keyword in step_keywords):
-                    categorized_labels["Step Labels"].append(label)
-                elif any(keyword in label for keyword in hole_keywords):
-                    categorized_labels["Hole Labels"].append(label)
-                elif any(keyword in label for keyword in slot_keywords):
-                    categorized_labels["Slot Labels"].append(label)
-                elif any(keyword in label for keyword in pocket_keywords):
-                    categorized_labels["Pocket Labels"].append(label)
-                elif any(keyword in label for keyword in passage_keywords):
-                    categorized_labels["Passage Labels"].append(label)
-                else:
-                    categorized_labels["Other Labels"].append(label)
-
-            return categorized_labels
+            with self._lock:
+                cached = self._label_catalog.get(repository_id)
+                if cached is not None and cached[0] == self._label_catalog_version:
+                    return self._copy_catalog(cached[1])
+
+                all_labels = set()
+                if self._stale:
+                    query = """
+                    MATCH (r:Repository)-[:HAS_STRUCTURE]->(s)
+                    WHERE elementId(r) = $repository_id
+                    RETURN DISTINCT labels(s) AS labels
+                    """
+                    cursor = self.graph.query(query, repository_id=repository_id)
+
+                    for record in cursor:
+                        labels = record["labels"]
+                        if labels:
+                            all_labels.update(labels)
+                    return self._categorize_labels(all_labels)
+
+                for rel in self.store.outgoing_records(repository_id, "HAS_STRUCTURE"):
+                    structure = self.store.get_node_record(rel.target)
+                    if structure is not None:
+                        all_labels.update(structure.labels)
+
+                catalog = self._categorize_labels(all_labels)
+                self._label_catalog[repository_id] = (self._label_catalog_version, catalog)
+                return self._copy_catalog(catalog)
 
         except Exception as e:
             logger.error(f"Failed to get Repository structure: {e}")
-            return {}
\ No newline at end of file
+            return {}
@@ -1,33 +1,95 @@
-from py2neo import Graph
 import logging
 from config import Config
+from KG_Manage.connection_pool import ConnectionPool
 
 logger = logging.getLogger(__name__)
 
 
+SCHEMA_STATEMENTS = [
+    "CREATE INDEX face_structure_lookup IF NOT EXISTS "
+    "FOR (f:Face) ON (f.structure_english_name, f.structure_no, f.face_no)",
+    "CREATE INDEX face_structure_name IF NOT EXISTS FOR (f:Face) ON (f.structure_english_name)",
+    "CREATE INDEX repository_name IF NOT EXISTS FOR (r:Repository) ON (r.name)",
+    "CREATE INDEX import_batch_key IF NOT EXISTS FOR (n:_ImportBatch) ON (n._import_key)",
+    "CREATE INDEX face_import_id IF NOT EXISTS FOR (f:Face) ON (f.import_id)",
+    "CREATE CONSTRAINT face_uuid IF NOT EXISTS FOR (f:Face) REQUIRE f.uuid IS UNIQUE",
+    "CREATE CONSTRAINT repository_uuid IF NOT EXISTS FOR (r:Repository) REQUIRE r.uuid IS UNIQUE"
+]
+
+UUID_BACKFILL_LABELS = ["Face", "Repository"]
+
+
 class DatabaseManager:
 
 
     def __init__(self):
-        self.graph = None
+        self.graph = ConnectionPool(
+            Config.NEO4J_URI,
+            auth=(Config.NEO4J_USER, Config.NEO4J_PASSWORD),
+            max_size=Config.NEO4J_POOL_SIZE,
+            acquire_timeout=Config.NEO4J_ACQUIRE_TIMEOUT,
+            max_retries=Config.NEO4J_MAX_RETRIES,
+            retry_backoff=Config.NEO4J_RETRY_BACKOFF,
+            health_check_interval=Config.NEO4J_HEALTH_CHECK_INTERVAL
+        )
         self.connect_db()
 
     def connect_db(self):
 
         try:
-            self.graph = Graph(
-                Config.NEO4J_URI,
-                auth=(Config.NEO4J_USER, Config.NEO4J_PASSWORD)
-            )
+            self.graph.close()
+            self.graph.connect()
+            logger.info(f"Connected to Neo4j at {Config.NEO4J_URI} (pool size {Config.NEO4J_POOL_SIZE})")
 
-            self.graph.run("RETURN 1").evaluate()
-            logger.info(f"Connected to Neo4j at {Config.NEO4J_URI}")
+            if Config.NEO4J_BOOTSTRAP_SCHEMA:
+                self.ensure_schema()
             return True
         except Exception as e:
             logger.error(f"Neo4j connection failed: {e}")
-            self.graph = None
             return False
 
+    def ensure_schema(self):
+
+        if not self.graph:
+            return False
+
+        applied = 0
+        for statement in SCHEMA_STATEMENTS:
+            try:
+                self.graph.run(statement)
+                applied += 1
+            except Exception as e:
+                logger.warning(f"Schema statement failed: {statement} ({e})")
+
+        for label in UUID_BACKFILL_LABELS:
+            try:
+                self._backfill_uuids(label)
+            except Exception as e:
+                logger.warning(f"uuid backfill failed for {label}: {e}")
+
+        logger.info(f"Schema bootstrap completed: {applied}/{len(SCHEMA_STATEMENTS)} statements applied")
+        return applied == len(SCHEMA_STATEMENTS)
+
+    def _backfill_uuids(self, label: str):
+
+        query = f"""
+        MATCH (n:`{label}`) WHERE n.uuid IS NULL
+        WITH n LIMIT $batch_size
+        SET n.uuid = randomUUID()
+        RETURN count(n) AS updated
+        """
+
+        total = 0
+        while True:
+            updated = self.graph.run(query, batch_size=Config.SCHEMA_BACKFILL_BATCH_SIZE).evaluate() or 0
+            total += updated
+            if updated < Config.SCHEMA_BACKFILL_BATCH_SIZE:
+                break
+
+        if total:
+            logger.info(f"Assigned uuid to {total} {label} nodes")
+        return total
+
     def test_connection(self):
 
         try:
@@ -62,7 +124,7 @@ class DatabaseManager:
 
         return {
             "status": "ok",
-            "database_connected": self.graph is not None,
+            "database_connected": bool(self.graph),
             "app_title": Config.APP_TITLE
         }
 
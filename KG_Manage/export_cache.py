@@ -0,0 +1,125 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import List, Any, Optional, Iterable, Iterator, BinaryIO
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+ARTIFACT_SUFFIX = ".export"
+PARTIAL_SUFFIX = ".part"
+
+
+class ExportCache:
+
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None,
+                 max_entries: Optional[int] = None):
+        directory = directory if directory is not None else Config.EXPORT_CACHE_DIR
+        self.max_bytes = Config.EXPORT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.max_entries = Config.EXPORT_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self.directory = directory
+            self._purge_directory()
+        else:
+            self.directory = tempfile.mkdtemp(prefix="kg-export-cache-")
+
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(repository_id: Optional[str], labels: List[str], export_format: str, version: str) -> str:
+
+        payload = json.dumps([repository_id, sorted(set(labels)), export_format, version], ensure_ascii=False)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def make_scope(repository_id: Optional[str], labels: List[str], export_format: str) -> tuple:
+
+        return repository_id, tuple(sorted(set(labels))), export_format
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            try:
+                f = open(entry["path"], "rb")
+            except FileNotFoundError:
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return f
+
+    def store(self, key: str, scope: tuple, chunks: Iterable[Any]) -> Iterator[Any]:
+
+        fd, partial_path = tempfile.mkstemp(dir=self.directory, suffix=PARTIAL_SUFFIX)
+        completed = False
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+                    yield chunk
+            completed = True
+        finally:
+            if completed:
+                self._commit(key, scope, partial_path)
+            else:
+                self._remove_file(partial_path)
+
+    def _commit(self, key: str, scope: tuple, partial_path: str):
+
+        path = os.path.join(self.directory, key + ARTIFACT_SUFFIX)
+        try:
+            size = os.path.getsize(partial_path)
+            os.replace(partial_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to store export artifact {key}: {e}")
+            self._remove_file(partial_path)
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)["size"]
+            for stale_key in [k for k, entry in self._entries.items() if entry["scope"] == scope]:
+                self._drop(stale_key)
+
+            self._entries[key] = {"scope": scope, "path": path, "size": size}
+            self._total_bytes += size
+
+            while self._entries and (self._total_bytes > self.max_bytes or len(self._entries) > self.max_entries):
+                self._drop(next(iter(self._entries)))
+
+        logger.info(f"Cached export artifact {key} ({size} bytes)")
+
+    def _drop(self, key: str):
+
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry["size"]
+        self._remove_file(entry["path"])
+
+    def _purge_directory(self):
+
+        for name in os.listdir(self.directory):
+            if name.endswith(ARTIFACT_SUFFIX) or name.endswith(PARTIAL_SUFFIX):
+                self._remove_file(os.path.join(self.directory, name))
+
+    @staticmethod
+    def _remove_file(path: str):
+
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove export artifact {path}: {e}")
@@ -1,19 +1,221 @@
 import json
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
 from datetime import datetime
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Iterator
+
+from config import Config
+from KG_Manage.compression import available_encodings, compress_chunks
+from KG_Manage.export_cache import ExportCache
 
 logger = logging.getLogger(__name__)
 
 
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+XML_LAYOUTS = {
+    "full": ("  ", False, "RelationShipList", "RelationShip"),
+    "selective": ("    ", True, "EdgeList", "Edge")
+}
+
+XML_DECLARATION = '<?xml version="1.0" ?>\n'
+
+_ATTRIBUTE_ESCAPES = str.maketrans({
+    "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;",
+    "\n": "&#10;", "\r": "&#13;", "\t": "&#9;"
+})
+
+
+def _escape_attribute(value: Any) -> str:
+
+    return str(value).translate(_ATTRIBUTE_ESCAPES)
+
+
+def _natural_key(value: Any) -> tuple:
+
+    try:
+        return 0, int(value), ""
+    except (TypeError, ValueError):
+        return 1, 0, "" if value is None else str(value)
+
+
+class ExportFaceRecord:
+
+
+    __slots__ = ("face_no", "face_type", "outter_loop_size", "inner_loop_size", "is_convex_surface")
+
+    def __init__(self, face_no, face_type, outter_loop_size, inner_loop_size, is_convex_surface):
+        self.face_no = face_no
+        self.face_type = face_type
+        self.outter_loop_size = outter_loop_size
+        self.inner_loop_size = inner_loop_size
+        self.is_convex_surface = is_convex_surface
+
+    def attributes(self) -> tuple:
+
+        return (
+            ("FaceNo", self.face_no),
+            ("FaceType", self.face_type),
+            ("OutterLoopSize", self.outter_loop_size),
+            ("InnerLoopSize", self.inner_loop_size if self.inner_loop_size else ""),
+            ("IsConvexSurface", self.is_convex_surface)
+        )
+
+
+class ExportEdgeRecord:
+
+
+    __slots__ = ("source_face_no", "target_face_no", "is_intersection", "is_parallel", "is_vertical",
+                 "is_convexity", "size_edge_intersection", "relationship_type", "flag_angle_degree")
+
+    def __init__(self, source_face_no, target_face_no, properties: Dict[str, Any]):
+        self.source_face_no = source_face_no
+        self.target_face_no = target_face_no
+        self.is_intersection = properties.get("is_intersection")
+        self.is_parallel = properties.get("is_parallel")
+        self.is_vertical = properties.get("is_vertical")
+        self.is_convexity = properties.get("is_convexity")
+        self.size_edge_intersection = properties.get("size_edge_intersection")
+        self.relationship_type = properties.get("relationship_type")
+        self.flag_angle_degree = properties.get("flag_angle_degree")
+
+    def attributes(self) -> tuple:
+
+        return (
+            ("SourceFaceNo", self.source_face_no),
+            ("TargetFaceNo", self.target_face_no),
+            ("IsIntersection", self.is_intersection),
+            ("IsParallel", self.is_parallel),
+            ("IsVertical", self.is_vertical),
+            ("IsConvexity", self.is_convexity),
+            ("SizeEdgeIntersection", self.size_edge_intersection if self.size_edge_intersection else ""),
+            ("RelationShipType", self.relationship_type),
+            ("FlagAngleDegree", self.flag_angle_degree)
+        )
+
+
+class ExportStructureRecord:
+
+
+    __slots__ = ("structure_no", "structure_name", "structure_english_name", "faces", "edges")
+
+    def __init__(self, structure_no, structure_name, structure_english_name):
+        self.structure_no = structure_no
+        self.structure_name = structure_name
+        self.structure_english_name = structure_english_name
+        self.faces = {}
+        self.edges = []
+
+    def add_face(self, properties: Dict[str, Any]):
+
+        key = (
+            properties.get("face_no"),
+            properties.get("face_type"),
+            properties.get("outter_loop_size"),
+            properties.get("inner_loop_size"),
+            properties.get("is_convex_surface")
+        )
+        if key not in self.faces:
+            self.faces[key] = ExportFaceRecord(*key)
+
+    def add_edge(self, source: Dict[str, Any], properties: Dict[str, Any], target: Dict[str, Any]):
+
+        self.edges.append(ExportEdgeRecord(source.get("face_no"), target.get("face_no"), properties))
+
+    def sorted_faces(self) -> List[ExportFaceRecord]:
+
+        return sorted(self.faces.values(), key=lambda face: _natural_key(face.face_no))
+
+    def attributes(self) -> tuple:
+
+        return (
+            ("StructureNo", self.structure_no),
+            ("StructureName", self.structure_name),
+            ("StructureEnglishName", self.structure_english_name)
+        )
+
+
+def assemble_structures(rows: Iterable[Any]) -> Iterator[ExportStructureRecord]:
+
+    structure = None
+    current_key = None
+
+    for record in rows:
+        source = record["source"]
+        target = record["target"]
+
+        key = (record["label"], record["structure_no"])
+        if key != current_key:
+            if structure is not None:
+                yield structure
+            current_key = key
+            structure = ExportStructureRecord(record["structure_no"], source.get("structure_name") or "",
+                                              record["label"])
+
+        structure.add_face(source)
+        structure.add_face(target)
+        structure.add_edge(source, record["edge"], target)
+
+    if structure is not None:
+        yield structure
+
+
+class StructureXmlWriter:
+
+
+    def __init__(self, indent: str, declaration: bool, edge_list_tag: str, edge_tag: str):
+        self.indent = indent
+        self.declaration = declaration
+        self.edge_list_tag = edge_list_tag
+        self.edge_tag = edge_tag
+
+    def write(self, structures: Iterable[ExportStructureRecord]) -> Iterator[str]:
+
+        if self.declaration:
+            yield XML_DECLARATION
+
+        started = False
+        for structure in structures:
+            if not started:
+                yield "<StandardFeatureStructure>\n"
+                started = True
+            yield self.structure(structure)
+
+        yield "</StandardFeatureStructure>\n" if started else "<StandardFeatureStructure/>\n"
+
+    def structure(self, structure: ExportStructureRecord) -> str:
+
+        parts = []
+        self._open(parts, 1, "Structure", structure.attributes())
+        self._list(parts, "FaceList", "Face", [face.attributes() for face in structure.sorted_faces()])
+        self._list(parts, self.edge_list_tag, self.edge_tag, [edge.attributes() for edge in structure.edges])
+        parts.append(f"{self.indent}</Structure>\n")
+        return "".join(parts)
+
+    def _list(self, parts: List[str], list_tag: str, item_tag: str, items: List[tuple]):
+
+        pad = self.indent * 2
+        if not items:
+            parts.append(f"{pad}<{list_tag}/>\n")
+            return
+
+        parts.append(f"{pad}<{list_tag}>\n")
+        for attrs in items:
+            self._open(parts, 3, item_tag, attrs, empty=True)
+        parts.append(f"{pad}</{list_tag}>\n")
+
+    def _open(self, parts: List[str], depth: int, tag: str, attrs: Iterable[tuple], empty: bool = False):
+
+        rendered = "".join(f' {name}="{_escape_attribute(value)}"' for name, value in attrs)
+        parts.append(f"{self.indent * depth}<{tag}{rendered}{'/' if empty else ''}>\n")
+
+
 class ExportManager:
 
 
     def __init__(self, graph, data_loader):
         self.graph = graph
         self.data_loader = data_loader
+        self.cache = ExportCache() if Config.EXPORT_CACHE_ENABLED else None
 
     def export_data(self) -> Dict[str, Any]:
 
@@ -38,6 +240,84 @@ class ExportManager:
             "version": "v8"
         }
 
+    def export_ndjson(self) -> Iterator[str]:
+
+        if not self.graph:
+            raise Exception("Database not connected")
+
+        header = {
+            "record": "header",
+            "exported_at": datetime.now().isoformat(),
+            "version": "v8"
+        }
+
+        return self._chunked(self._iter_ndjson_records(header))
+
+    def _chunked(self, pieces: Iterable[str]) -> Iterator[str]:
+
+        buffer = []
+        buffered = 0
+
+        for piece in pieces:
+            buffer.append(piece)
+            buffered += len(piece)
+            if buffered >= EXPORT_CHUNK_SIZE:
+                yield "".join(buffer)
+                buffer = []
+                buffered = 0
+
+        if buffer:
+            yield "".join(buffer)
+
+    def _iter_ndjson_records(self, header: Dict[str, Any]) -> Iterator[str]:
+
+        yield json.dumps(header, ensure_ascii=False) + "\n"
+
+        node_count = 0
+        node_query = """
+        MATCH (n) WHERE elementId(n) > $after
+        WITH n ORDER BY elementId(n) LIMIT $batch_size
+        RETURN elementId(n) AS id, labels(n) AS labels, properties(n) AS props
+        """
+        for record in self._keyset_batches(node_query, "id"):
+            node_count += 1
+            yield json.dumps({
+                "record": "node",
+                "id": record["id"],
+                "labels": list(record["labels"]),
+                "properties": dict(record["props"] or {})
+            }, ensure_ascii=False, default=str) + "\n"
+
+        rel_count = 0
+        rel_query = """
+        MATCH (a)-[r]->(b) WHERE elementId(r) > $after
+        WITH a, r, b ORDER BY elementId(r) LIMIT $batch_size
+        RETURN elementId(r) AS rid, elementId(a) AS source, elementId(b) AS target,
+               type(r) AS type, properties(r) AS props
+        """
+        for record in self._keyset_batches(rel_query, "rid"):
+            rel_count += 1
+            yield json.dumps({
+                "record": "relationship",
+                "id": record["rid"],
+                "source": record["source"],
+                "target": record["target"],
+                "type": record["type"],
+                "properties": dict(record["props"] or {})
+            }, ensure_ascii=False, default=str) + "\n"
+
+        logger.info(f"NDJSON export completed: {node_count} Node, {rel_count} Relationship")
+
+    def _keyset_batches(self, query: str, key: str) -> Iterator[Dict[str, Any]]:
+
+        after = ""
+        while True:
+            records = self.graph.query(query, after=after, batch_size=Config.EXPORT_BATCH_SIZE).data()
+            yield from records
+            if len(records) < Config.EXPORT_BATCH_SIZE:
+                break
+            after = records[-1][key]
+
     def selective_export(self, selected_labels: List[str]) -> Dict[str, Any]:
 
         if not self.graph:
@@ -58,14 +338,13 @@ class ExportManager:
 
 
             if node_ids:
-                node_ids_str = "', '".join(node_ids)
-                query = f"""
+                query = """
                 MATCH (main)-[:HAS_FACE]-(face:Face)
-                WHERE elementId(main) IN ['{node_ids_str}']
+                WHERE elementId(main) IN $node_ids
                 RETURN DISTINCT elementId(face) AS id, labels(face) AS labels, properties(face) AS props
                 """
 
-                cursor = self.graph.run(query)
+                cursor = self.graph.query(query, node_ids=list(node_ids))
                 for record in cursor:
                     face_id = record["id"]
                     if face_id not in node_ids:
@@ -79,15 +358,14 @@ class ExportManager:
 
 
             if node_ids:
-                node_ids_str = "', '".join(node_ids)
-                query = f"""
+                query = """
                 MATCH (a)-[r]->(b)
-                WHERE elementId(a) IN ['{node_ids_str}'] AND elementId(b) IN ['{node_ids_str}']
+                WHERE elementId(a) IN $node_ids AND elementId(b) IN $node_ids
                 RETURN elementId(r) AS rid, elementId(a) AS source, elementId(b) AS target,
                        type(r) AS type, properties(r) AS props
                 """
 
-                cursor = self.graph.run(query)
+                cursor = self.graph.query(query, node_ids=list(node_ids))
                 for record in cursor:
                     rel_data = {
                         "id": record["rid"],
@@ -124,331 +402,152 @@ class ExportManager:
 
     def export_to_xml(self, selected_labels: Optional[List[str]] = None) -> str:
 
-        if not self.graph:
-            raise Exception("Database not connected")
-
-        try:
-
-            if selected_labels is None:
-                all_labels_data = self.data_loader.get_available_labels()
-                selected_labels = []
-                for category_labels in all_labels_data.values():
-                    selected_labels.extend(category_labels)
-
-
-            root = ET.Element("StandardFeatureStructure")
-
-
-            for label in selected_labels:
-
-                query = f"""
-                MATCH (n:Face)-[r:RELATIONSHIP]->(f:Face)
-                WHERE n.structure_english_name = '{label}' AND f.structure_english_name = '{label}'
-                RETURN n, r, f
-                """
-
-                cursor = self.graph.run(query)
-                structures = {}
-
-                for record in cursor:
-                    n = record["n"]
-                    r = record["r"]
-                    f = record["f"]
-
-                    structure_no = n.get("structure_no", "1")
-
-
-                    if structure_no not in structures:
-                        structures[structure_no] = {
-                            "StructureNo": structure_no,
-                            "StructureName": n.get("structure_name", ""),
-                            "StructureEnglishName": n.get("structure_english_name", label),
-                            "FaceList": [],
-                            "RelationShipList": []
-                        }
-
-
-                    face_info_n = {
-                        "FaceNo": n.get("face_no"),
-                        "FaceType": n.get("face_type"),
-                        "OutterLoopSize": n.get("outter_loop_size"),
-                        "InnerLoopSize": n.get("inner_loop_size"),
-                        "IsConvexSurface": n.get("is_convex_surface")
-                    }
-                    face_info_f = {
-                        "FaceNo": f.get("face_no"),
-                        "FaceType": f.get("face_type"),
-                        "OutterLoopSize": f.get("outter_loop_size"),
-                        "InnerLoopSize": f.get("inner_loop_size"),
-                        "IsConvexSurface": f.get("is_convex_surface")
-                    }
-
-
-                    if face_info_n not in structures[structure_no]["FaceList"]:
-                        structures[structure_no]["FaceList"].append(face_info_n)
-                    if face_info_f not in structures[structure_no]["FaceList"]:
-                        structures[structure_no]["FaceList"].append(face_info_f)
+        return "".join(self.stream_export_xml(selected_labels))
 
+    def selective_export_xml(self, selected_labels: List[str], repository_id: str = None) -> str:
 
-                    relationship_info = {
-                        "SourceFaceNo": n.get("face_no"),
-                        "TargetFaceNo": f.get("face_no"),
-                        "IsIntersection": r.get("is_intersection"),
-                        "IsParallel": r.get("is_parallel"),
-                        "IsVertical": r.get("is_vertical"),
-                        "IsConvexity": r.get("is_convexity"),
-                        "SizeEdgeIntersection": r.get("size_edge_intersection"),
-                        "RelationShipType": r.get("relationship_type"),
-                        "FlagAngleDegree": r.get("flag_angle_degree")
-                    }
-                    structures[structure_no]["RelationShipList"].append(relationship_info)
-
-
-                for structure in structures.values():
-                    structure_elem = ET.SubElement(root, "Structure")
-                    structure_elem.set("StructureNo", str(structure["StructureNo"]))
-                    structure_elem.set("StructureName", str(structure["StructureName"]))
-                    structure_elem.set("StructureEnglishName", str(structure["StructureEnglishName"]))
-
-                    # FaceList
-                    face_list_elem = ET.SubElement(structure_elem, "FaceList")
-                    for face in structure["FaceList"]:
-                        face_elem = ET.SubElement(face_list_elem, "Face")
-                        face_elem.set("FaceNo", str(face["FaceNo"]))
-                        face_elem.set("FaceType", str(face["FaceType"]))
-                        face_elem.set("OutterLoopSize", str(face["OutterLoopSize"]))
-                        face_elem.set("InnerLoopSize", str(face["InnerLoopSize"]) if face["InnerLoopSize"] else "")
-                        face_elem.set("IsConvexSurface", str(face["IsConvexSurface"]))
-
-                    # RelationShipList
-                    rel_list_elem = ET.SubElement(structure_elem, "RelationShipList")
-                    for relationship in structure["RelationShipList"]:
-                        rel_elem = ET.SubElement(rel_list_elem, "RelationShip")
-                        rel_elem.set("SourceFaceNo", str(relationship["SourceFaceNo"]))
-                        rel_elem.set("TargetFaceNo", str(relationship["TargetFaceNo"]))
-                        rel_elem.set("IsIntersection", str(relationship["IsIntersection"]))
-                        rel_elem.set("IsParallel", str(relationship["IsParallel"]))
-                        rel_elem.set("IsVertical", str(relationship["IsVertical"]))
-                        rel_elem.set("IsConvexity", str(relationship["IsConvexity"]))
-                        rel_elem.set("SizeEdgeIntersection", str(relationship["SizeEdgeIntersection"]) if relationship[
-                            "SizeEdgeIntersection"] else "")
-                        rel_elem.set("RelationShipType", str(relationship["RelationShipType"]))
-                        rel_elem.set("FlagAngleDegree", str(relationship["FlagAngleDegree"]))
-
-
-            xml_str = self.prettify_xml(root)
-
-            logger.info(f"StandardFeatureStructure XML export completed")
-            return xml_str
-
-        except Exception as e:
-            logger.error(f"XML export failed: {e}")
-            raise e
+        return "".join(self.stream_selective_export_xml(selected_labels, repository_id))
 
-    def selective_export_xml(self, selected_labels: List[str]) -> str:
+    def stream_export_xml(self, selected_labels: Optional[List[str]] = None) -> Iterator[str]:
 
         if not self.graph:
             raise Exception("Database not connected")
 
-        try:
-
-            all_structures = []
-            for label in selected_labels:
-                structures = self._get_structures_by_label_exact_format(label)
-                all_structures.extend(structures)
-
-
-            xml_content = self._generate_xml_exact_format(all_structures)
-
-            logger.info(f"StandardFeatureStructure XML export completed")
-            return xml_content
+        if selected_labels is None:
+            selected_labels = self._all_labels()
 
-        except Exception as e:
-            logger.error(f"XML export failed: {e}")
-            raise e
+        return self._stream_xml(StructureXmlWriter(*XML_LAYOUTS["full"]), self._structures(selected_labels),
+                                "StandardFeatureStructure XML export completed")
 
-    def selective_export_xml(self, selected_labels: List[str], repository_id: str = None) -> str:
+    def stream_selective_export_xml(self, selected_labels: List[str], repository_id: str = None) -> Iterator[str]:
 
         if not self.graph:
             raise Exception("Database not connected")
 
-        try:
+        return self._stream_xml(StructureXmlWriter(*XML_LAYOUTS["selective"]),
+                                self._structures(selected_labels, repository_id),
+                                self._export_message(repository_id))
 
-            root = ET.Element("StandardFeatureStructure")
+    def export_xml_artifact(self, layout: str, selected_labels: Optional[List[str]] = None,
+                            repository_id: Optional[str] = None, encoding: Optional[str] = None) -> Dict[str, Any]:
 
+        if not self.graph:
+            raise Exception("Database not connected")
+        if layout not in XML_LAYOUTS:
+            raise Exception(f"Unknown XML export layout: {layout}")
+        if encoding is not None and encoding not in available_encodings():
+            raise Exception(f"Unsupported export compression: {encoding}")
 
-            for label in selected_labels:
+        if selected_labels is None:
+            selected_labels = self._all_labels()
 
-                if repository_id:
-                    query = f"""
-                    MATCH (r:Repository)-[:HAS_STRUCTURE]->(main)-[:HAS_FACE]->(n:Face)-[rel:RELATIONSHIP]->(f:Face)
-                    WHERE elementId(r) = $repository_id 
-                    AND n.structure_english_name = '{label}' 
-                    AND f.structure_english_name = '{label}'
-                    RETURN n, rel, f
-                    """
-                    cursor = self.graph.run(query, repository_id=repository_id)
-                else:
-
-                    query = f"""
-                    MATCH (n:Face)-[r:RELATIONSHIP]->(f:Face)
-                    WHERE n.structure_english_name = '{label}' AND f.structure_english_name = '{label}'
-                    RETURN n, r, f
-                    """
-                    cursor = self.graph.run(query)
-
-                structures = {}
+        stream = self._lazy_xml(layout, selected_labels, repository_id)
+        if encoding is not None:
+            stream = compress_chunks(stream, encoding)
 
-                for record in cursor:
-                    n = record["n"]
-                    r = record["rel"]
-                    f = record["f"]
+        version = self.data_loader.get_export_version(repository_id) if self.cache is not None else None
+        if version is None:
+            return {"etag": None, "file": None, "stream": stream, "encoding": encoding}
 
-                    structure_no = n.get("structure_no", "1")
+        export_format = f"xml-{layout}" + (f"+{encoding}" if encoding else "")
+        key = ExportCache.make_key(repository_id, selected_labels, export_format, version)
+        cached = self.cache.open(key)
+        if cached is not None:
+            stream.close()
+            logger.info(f"Serving cached {export_format} export {key}")
+            return {"etag": key, "file": cached, "stream": None, "encoding": encoding}
 
+        scope = ExportCache.make_scope(repository_id, selected_labels, export_format)
+        return {"etag": key, "file": None, "stream": self.cache.store(key, scope, stream), "encoding": encoding}
 
-                    if structure_no not in structures:
-                        structures[structure_no] = {
-                            "StructureNo": structure_no,
-                            "StructureName": n.get("structure_name", ""),
-                            "StructureEnglishName": n.get("structure_english_name", label),
-                            "FaceList": [],
-                            "RelationShipList": []
-                        }
+    def _lazy_xml(self, layout: str, selected_labels: List[str], repository_id: Optional[str]) -> Iterator[str]:
 
+        message = "StandardFeatureStructure XML export completed" if layout == "full" \
+            else self._export_message(repository_id)
+        yield from self._stream_xml(StructureXmlWriter(*XML_LAYOUTS[layout]),
+                                    self._structures(selected_labels, repository_id), message)
 
-                    face_info_n = {
-                        "FaceNo": n.get("face_no"),
-                        "FaceType": n.get("face_type"),
-                        "OutterLoopSize": n.get("outter_loop_size"),
-                        "InnerLoopSize": n.get("inner_loop_size"),
-                        "IsConvexSurface": n.get("is_convex_surface")
-                    }
-                    face_info_f = {
-                        "FaceNo": f.get("face_no"),
-                        "FaceType": f.get("face_type"),
-                        "OutterLoopSize": f.get("outter_loop_size"),
-                        "InnerLoopSize": f.get("inner_loop_size"),
-                        "IsConvexSurface": f.get("is_convex_surface")
-                    }
+    def _all_labels(self) -> List[str]:
 
+        all_labels_data = self.data_loader.get_available_labels()
+        selected_labels = []
+        for category_labels in all_labels_data.values():
+            selected_labels.extend(category_labels)
+        return selected_labels
 
-                    if face_info_n not in structures[structure_no]["FaceList"]:
-                        structures[structure_no]["FaceList"].append(face_info_n)
-                    if face_info_f not in structures[structure_no]["FaceList"]:
-                        structures[structure_no]["FaceList"].append(face_info_f)
+    @staticmethod
+    def _export_message(repository_id: Optional[str]) -> str:
 
+        if repository_id:
+            return "StandardFeatureStructure XML export based on Repository is completed"
+        return "StandardFeatureStructure XML export completed"
 
-                    relationship_info = {
-                        "SourceFaceNo": n.get("face_no"),
-                        "TargetFaceNo": f.get("face_no"),
-                        "IsIntersection": r.get("is_intersection"),
-                        "IsParallel": r.get("is_parallel"),
-                        "IsVertical": r.get("is_vertical"),
-                        "IsConvexity": r.get("is_convexity"),
-                        "SizeEdgeIntersection": r.get("size_edge_intersection"),
-                        "RelationShipType": r.get("relationship_type"),
-                        "FlagAngleDegree": r.get("flag_angle_degree")
-                    }
-                    structures[structure_no]["RelationShipList"].append(relationship_info)
-
-
-                for structure in structures.values():
-                    structure_elem = ET.SubElement(root, "Structure")
-                    structure_elem.set("StructureNo", str(structure["StructureNo"]))
-                    structure_elem.set("StructureName", str(structure["StructureName"]))
-                    structure_elem.set("StructureEnglishName", str(structure["StructureEnglishName"]))
-
-                    # FaceList
-                    face_list_elem = ET.SubElement(structure_elem, "FaceList")
-                    for face in structure["FaceList"]:
-                        face_elem = ET.SubElement(face_list_elem, "Face")
-                        face_elem.set("FaceNo", str(face["FaceNo"]))
-                        face_elem.set("FaceType", str(face["FaceType"]))
-                        face_elem.set("OutterLoopSize", str(face["OutterLoopSize"]))
-                        face_elem.set("InnerLoopSize", str(face["InnerLoopSize"]) if face["InnerLoopSize"] else "")
-                        face_elem.set("IsConvexSurface", str(face["IsConvexSurface"]))
-
-                    # RelationShipList
-                    rel_list_elem = ET.SubElement(structure_elem, "EdgeList")
-                    for relationship in structure["RelationShipList"]:
-                        rel_elem = ET.SubElement(rel_list_elem, "Edge")
-                        rel_elem.set("SourceFaceNo", str(relationship["SourceFaceNo"]))
-                        rel_elem.set("TargetFaceNo", str(relationship["TargetFaceNo"]))
-                        rel_elem.set("IsIntersection", str(relationship["IsIntersection"]))
-                        rel_elem.set("IsParallel", str(relationship["IsParallel"]))
-                        rel_elem.set("IsVertical", str(relationship["IsVertical"]))
-                        rel_elem.set("IsConvexity", str(relationship["IsConvexity"]))
-                        rel_elem.set("SizeEdgeIntersection", str(relationship["SizeEdgeIntersection"]) if relationship[
-                            "SizeEdgeIntersection"] else "")
-                        rel_elem.set("RelationShipType", str(relationship["RelationShipType"]))
-                        rel_elem.set("FlagAngleDegree", str(relationship["FlagAngleDegree"]))
-
-
-            from xml.dom import minidom
-            rough_string = ET.tostring(root, 'utf-8')
-            reparsed = minidom.parseString(rough_string)
-            pretty_xml = reparsed.toprettyxml(indent="    ")
-
-            logger.info(f"StandardFeatureStructure XML export based on Repository is completed")
-            return pretty_xml
+    def _stream_xml(self, writer: StructureXmlWriter, structures: Iterable[ExportStructureRecord],
+                    message: str) -> Iterator[str]:
 
+        try:
+            yield from self._chunked(writer.write(structures))
+            logger.info(message)
         except Exception as e:
-            logger.error(f"XML export failed·: {e}")
+            logger.error(f"XML export failed: {e}")
             raise e
 
-
-    def _generate_xml_exact_format(self, structures: List[Dict[str, Any]]) -> str:
-
-        root = ET.Element("StandardFeatureStructure")
-
-        for structure in structures:
-            structure_elem = ET.SubElement(root, "Structure", {
-                "StructureNo": str(structure["StructureNo"]),
-                "StructureName": str(structure["StructureName"]),
-                "StructureEnglishName": str(structure["StructureEnglishName"])
-            })
-
-            # FaceList
-            face_list_elem = ET.SubElement(structure_elem, "FaceList")
-            for face in structure["FaceList"]:
-                face_attrs = {
-                    "FaceNo": str(face["FaceNo"]),
-                    "FaceType": str(face["FaceType"]),
-                    "OutterLoopSize": str(face["OutterLoopSize"]),
-                    "InnerLoopSize": str(face["InnerLoopSize"]) if face["InnerLoopSize"] is not None else "",
-                    "IsConvexSurface": str(face["IsConvexSurface"])
-                }
-                ET.SubElement(face_list_elem, "Face", face_attrs)
-
-            # RelationShipList
-            relationship_list_elem = ET.SubElement(structure_elem, "EdgeList")
-            for relationship in structure["RelationShipList"]:
-                rel_attrs = {
-                    "SourceFaceNo": str(relationship["SourceFaceNo"]),
-                    "TargetFaceNo": str(relationship["TargetFaceNo"]),
-                    "IsIntersection": str(relationship["IsIntersection"]),
-                    "IsParallel": str(relationship["IsParallel"]),
-                    "IsVertical": str(relationship["IsVertical"]),
-                    "IsConvexity": str(relationship["IsConvexity"]),
-                    "SizeEdgeIntersection": str(relationship["SizeEdgeIntersection"]) if relationship[
-                                                                                             "SizeEdgeIntersection"] is not None else "",
-                    "RelationShipType": str(relationship["RelationShipType"]),
-                    "FlagAngleDegree": str(relationship["FlagAngleDegree"])
-                }
-                ET.SubElement(relationship_list_elem, "Edge", rel_attrs)
-
-
-        from xml.dom import minidom
-        rough_string = ET.tostring(root, 'utf-8')
-        reparsed = minidom.parseString(rough_string)
-        pretty_xml = reparsed.toprettyxml(indent="    ")
-
-        return pretty_xml
-
-    def prettify_xml(self, elem: ET.Element) -> str:
-
-        rough_string = ET.tostring(elem, 'utf-8')
-        reparsed = minidom.parseString(rough_string)
-        pretty_xml = reparsed.toprettyxml(indent="  ")[23:]
-        return pretty_xml
\ No newline at end of file
+    def _structures(self, selected_labels: List[str],
+                    repository_id: Optional[str] = None) -> Iterable[ExportStructureRecord]:
+
+        labels = sorted(set(selected_labels))
+        if not labels:
+            return []
+
+        return assemble_structures(self._structure_rows(labels, repository_id))
+
+    def _structure_rows(self, labels: List[str], repository_id: Optional[str]) -> Iterator[Dict[str, Any]]:
+
+        if repository_id:
+            key_match = """
+            MATCH (r:Repository)-[:HAS_STRUCTURE]->()-[:HAS_FACE]->(n:Face)
+            WHERE elementId(r) = $repository_id
+            AND n.structure_english_name IN $labels
+            """
+            match = """
+            MATCH (r:Repository)-[:HAS_STRUCTURE]->(main)-[:HAS_FACE]->(n:Face)-[rel:RELATIONSHIP]->(f:Face)
+            WHERE elementId(r) = $repository_id
+            AND n.structure_english_name IN $labels
+            AND f.structure_english_name = n.structure_english_name
+            """
+        else:
+            key_match = """
+            MATCH (n:Face)
+            WHERE n.structure_english_name IN $labels
+            """
+            match = """
+            MATCH (n:Face)-[rel:RELATIONSHIP]->(f:Face)
+            WHERE n.structure_english_name IN $labels
+            AND f.structure_english_name = n.structure_english_name
+            """
+
+        key_query = key_match + """
+        WITH DISTINCT n.structure_english_name AS label, coalesce(n.structure_no, "1") AS structure_no
+        RETURN label, structure_no
+        ORDER BY label, toInteger(structure_no), structure_no
+        """
+        query = match + """
+        AND [n.structure_english_name, coalesce(n.structure_no, "1")] IN $keys
+        WITH n, rel, f, n.structure_english_name AS label, coalesce(n.structure_no, "1") AS structure_no
+        RETURN label, structure_no,
+               n {.face_no, .face_type, .outter_loop_size, .inner_loop_size, .is_convex_surface,
+                  .structure_name} AS source,
+               rel {.is_intersection, .is_parallel, .is_vertical, .is_convexity, .size_edge_intersection,
+                    .relationship_type, .flag_angle_degree} AS edge,
+               f {.face_no, .face_type, .outter_loop_size, .inner_loop_size, .is_convex_surface} AS target
+        ORDER BY label, toInteger(structure_no), structure_no,
+                 toInteger(source.face_no), source.face_no, toInteger(target.face_no), target.face_no
+        """
+
+        keys = [[record["label"], record["structure_no"]]
+                for record in self.graph.query(key_query, labels=labels, repository_id=repository_id)]
+
+        for start in range(0, len(keys), Config.EXPORT_STRUCTURE_BATCH_SIZE):
+            batch = keys[start:start + Config.EXPORT_STRUCTURE_BATCH_SIZE]
+            yield from self.graph.query(query, labels=sorted({key[0] for key in batch}), keys=batch,
+                                        repository_id=repository_id)
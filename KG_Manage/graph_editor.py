@@ -7,6 +7,8 @@ from node_manager import NodeManager
 from relationship_manager import RelationshipManager
 from KG_Manage.export_manager import ExportManager
 from KG_Manage.import_manager import ImportManager
+from KG_Manage.import_jobs import ImportJobManager
+from KG_Manage.import_validator import ImportValidator
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +23,7 @@ class Neo4jGraphEditor:
         self.relationship_manager = RelationshipManager(self.db_manager.graph, self.data_loader)
         self.export_manager = ExportManager(self.db_manager.graph, self.data_loader)
         self.import_manager = ImportManager(self.db_manager.graph, self.data_loader)
+        self.import_jobs = ImportJobManager(self.import_manager)
 
 
         self.palette = Config.COLOR_PALETTE
@@ -55,6 +58,14 @@ class Neo4jGraphEditor:
 
         return self.data_loader.reload_db()
 
+    def ensure_loaded(self):
+
+        return self.data_loader.ensure_loaded()
+
+    def get_graph_etag(self):
+
+        return self.data_loader.get_graph_etag()
+
     def test_connection(self):
 
         return self.db_manager.test_connection()
@@ -75,6 +86,27 @@ class Neo4jGraphEditor:
 
         return self.data_loader.get_graph_data()
 
+    def get_graph_page(self, limit: int, cursor: Optional[str] = None, label: Optional[str] = None,
+                       repository_id: Optional[str] = None, cumulative: bool = False):
+
+        return self.data_loader.get_graph_page(limit, cursor, label, repository_id, cumulative)
+
+    def get_structure_overview(self, repository_id: Optional[str] = None):
+
+        return self.data_loader.get_structure_overview(repository_id)
+
+    def get_structure_detail(self, structure_id: str):
+
+        return self.data_loader.get_structure_detail(structure_id)
+
+    def search_nodes(self, query: str, limit: int = 10, labels: Optional[List[str]] = None):
+
+        return self.data_loader.search_nodes(query, limit, labels)
+
+    def get_node(self, node_id: str):
+
+        return self.data_loader.get_node(node_id)
+
     def get_available_labels(self):
 
         return self.data_loader.get_available_labels()
@@ -118,6 +150,10 @@ class Neo4jGraphEditor:
 
         return self.export_manager.export_data()
 
+    def export_ndjson(self):
+
+        return self.export_manager.export_ndjson()
+
     def selective_export(self, selected_labels: List[str]):
 
         return self.export_manager.selective_export(selected_labels)
@@ -130,6 +166,19 @@ class Neo4jGraphEditor:
 
         return self.export_manager.selective_export_xml(selected_labels, repository_id)
 
+    def stream_export_xml(self, selected_labels: Optional[List[str]] = None):
+
+        return self.export_manager.stream_export_xml(selected_labels)
+
+    def stream_selective_export_xml(self, selected_labels: List[str], repository_id: str = None):
+
+        return self.export_manager.stream_selective_export_xml(selected_labels, repository_id)
+
+    def export_xml_artifact(self, layout: str, selected_labels: Optional[List[str]] = None,
+                            repository_id: Optional[str] = None, encoding: Optional[str] = None):
+
+        return self.export_manager.export_xml_artifact(layout, selected_labels, repository_id, encoding)
+
 
     def import_data(self, data: Dict[str, Any]):
 
@@ -139,9 +188,41 @@ class Neo4jGraphEditor:
 
         return self.import_manager.clean_import_data(data)
 
-    def import_from_xml(self, xml_content: str, repository_name: str = None):
+    def import_from_xml(self, xml_content: str, repository_name: str = None, replace_existing: bool = False):
+
+        return self.import_manager.import_from_xml(xml_content, repository_name, replace_existing)
+
+    def import_from_xml_file(self, source, repository_name: str = None, replace_existing: bool = False):
+
+        return self.import_manager.import_from_xml_file(source, repository_name, replace_existing=replace_existing)
+
+    def import_from_upload(self, raw, filename: str, repository_name: str = None, replace_existing: bool = False):
+
+        return self.import_manager.import_from_upload(raw, filename, repository_name, replace_existing=replace_existing)
+
+    def validate_import_xml(self, source):
+
+        return ImportValidator().validate(source)
+
+    def validate_import_upload(self, raw, filename: str):
+
+        return ImportValidator().validate_upload(raw, filename)
+
+    def submit_import_job(self, stream, filename: str, repository_name: str, replace_existing: bool = False):
+
+        return self.import_jobs.submit_xml(stream, filename, repository_name, replace_existing)
+
+    def get_import_job(self, job_id: str):
+
+        return self.import_jobs.get_job(job_id)
+
+    def list_import_jobs(self):
+
+        return self.import_jobs.list_jobs()
+
+    def cancel_import_job(self, job_id: str):
 
-        return self.import_manager.import_from_xml(xml_content, repository_name)
+        return self.import_jobs.cancel_job(job_id)
 
 
     def env(self, key: str, default=None):
@@ -0,0 +1,380 @@
+import logging
+import sys
+from typing import Dict, List, Any, Optional, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+FACE_PROPERTIES = (
+    "face_no", "face_type", "outter_loop_size", "inner_loop_size",
+    "is_convex_surface", "structure_no", "structure_english_name", "color"
+)
+
+OPTIONAL_FACE_PROPERTIES = ("uuid",)
+
+RELATIONSHIP_PROPERTIES = (
+    "is_intersection", "is_parallel", "is_vertical", "is_convexity",
+    "size_edge_intersection", "relationship_type", "flag_angle_degree", "color"
+)
+
+_FACE_KEYS = frozenset(FACE_PROPERTIES)
+_FACE_KEYS_WITH_OPTIONAL = frozenset(FACE_PROPERTIES + OPTIONAL_FACE_PROPERTIES)
+_RELATIONSHIP_KEYS = frozenset(RELATIONSHIP_PROPERTIES)
+_INTERN_MAX_LENGTH = 64
+
+
+def _intern(value):
+
+    if isinstance(value, str) and len(value) <= _INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+class NodeRecord:
+
+
+    __slots__ = ("id", "labels", "props")
+
+    def __init__(self, node_id: str, labels: List[str], properties: Dict[str, Any]):
+        self.id = _intern(node_id)
+        self.labels = tuple(_intern(label) for label in labels)
+        self.props = {_intern(k): _intern(v) for k, v in properties.items()}
+
+    @property
+    def properties(self) -> Dict[str, Any]:
+
+        return dict(self.props)
+
+    def get(self, key: str, default=None):
+
+        return self.props.get(key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+
+        return {
+            "id": self.id,
+            "labels": list(self.labels),
+            "properties": dict(self.props)
+        }
+
+
+class FaceRecord:
+
+
+    __slots__ = ("id",) + FACE_PROPERTIES + OPTIONAL_FACE_PROPERTIES
+
+    labels = ("Face",)
+
+    def __init__(self, node_id: str, properties: Dict[str, Any]):
+        self.id = _intern(node_id)
+        for key in FACE_PROPERTIES:
+            setattr(self, key, _intern(properties[key]))
+        for key in OPTIONAL_FACE_PROPERTIES:
+            setattr(self, key, properties.get(key))
+
+    @property
+    def properties(self) -> Dict[str, Any]:
+
+        properties = {key: getattr(self, key) for key in FACE_PROPERTIES}
+        for key in OPTIONAL_FACE_PROPERTIES:
+            value = getattr(self, key)
+            if value is not None:
+                properties[key] = value
+        return properties
+
+    def get(self, key: str, default=None):
+
+        if key in _FACE_KEYS_WITH_OPTIONAL:
+            value = getattr(self, key)
+            return default if value is None else value
+        return default
+
+    def to_dict(self) -> Dict[str, Any]:
+
+        return {
+            "id": self.id,
+            "labels": ["Face"],
+            "properties": self.properties
+        }
+
+
+class RelRecord:
+
+
+    __slots__ = ("id", "source", "target", "type", "props")
+
+    def __init__(self, rel_id: str, source: str, target: str, rel_type: str, properties: Dict[str, Any]):
+        self.id = _intern(rel_id)
+        self.source = _intern(source)
+        self.target = _intern(target)
+        self.type = _intern(rel_type)
+        self.props = {_intern(k): _intern(v) for k, v in properties.items()}
+
+    @property
+    def properties(self) -> Dict[str, Any]:
+
+        return dict(self.props)
+
+    def get(self, key: str, default=None):
+
+        return self.props.get(key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+
+        return {
+            "id": self.id,
+            "source": self.source,
+            "target": self.target,
+            "type": self.type,
+            "properties": dict(self.props)
+        }
+
+
+class RelationshipRecord:
+
+
+    __slots__ = ("id", "source", "target") + RELATIONSHIP_PROPERTIES
+
+    type = "RELATIONSHIP"
+
+    def __init__(self, rel_id: str, source: str, target: str, properties: Dict[str, Any]):
+        self.id = _intern(rel_id)
+        self.source = _intern(source)
+        self.target = _intern(target)
+        for key in RELATIONSHIP_PROPERTIES:
+            setattr(self, key, _intern(properties[key]))
+
+    @property
+    def properties(self) -> Dict[str, Any]:
+
+        return {key: getattr(self, key) for key in RELATIONSHIP_PROPERTIES}
+
+    def get(self, key: str, default=None):
+
+        return getattr(self, key) if key in _RELATIONSHIP_KEYS else default
+
+    def to_dict(self) -> Dict[str, Any]:
+
+        return {
+            "id": self.id,
+            "source": self.source,
+            "target": self.target,
+            "type": "RELATIONSHIP",
+            "properties": self.properties
+        }
+
+
+def make_node_record(node_id: str, labels: List[str], properties: Dict[str, Any]):
+
+    if len(labels) == 1 and labels[0] == "Face" and _FACE_KEYS <= properties.keys() <= _FACE_KEYS_WITH_OPTIONAL:
+        return FaceRecord(node_id, properties)
+    return NodeRecord(node_id, labels, properties)
+
+
+def make_rel_record(rel_id: str, source: str, target: str, rel_type: str, properties: Dict[str, Any]):
+
+    if rel_type == "RELATIONSHIP" and properties.keys() == _RELATIONSHIP_KEYS:
+        return RelationshipRecord(rel_id, source, target, properties)
+    return RelRecord(rel_id, source, target, rel_type, properties)
+
+
+class StoreView:
+
+
+    def __init__(self, records: Dict[str, Any]):
+        self._records = records
+
+    def __len__(self) -> int:
+
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+
+        return (record.to_dict() for record in self._records.values())
+
+    def __bool__(self) -> bool:
+
+        return bool(self._records)
+
+
+class GraphStore:
+
+
+    def __init__(self):
+        self._nodes = {}
+        self._rels = {}
+        self._outgoing = {}
+        self._incoming = {}
+        self._labels = {}
+
+        self.nodes = StoreView(self._nodes)
+        self.rels = StoreView(self._rels)
+
+    def clear(self):
+
+        self._nodes.clear()
+        self._rels.clear()
+        self._outgoing.clear()
+        self._incoming.clear()
+        self._labels.clear()
+
+
+    def get_node(self, node_id: str) -> Optional[Dict[str, Any]]:
+
+        record = self._nodes.get(node_id)
+        return record.to_dict() if record is not None else None
+
+    def get_node_record(self, node_id: str):
+
+        return self._nodes.get(node_id)
+
+    def has_node(self, node_id: str) -> bool:
+
+        return node_id in self._nodes
+
+    def add_node(self, node: Dict[str, Any]) -> Dict[str, Any]:
+
+        node_id = node["id"]
+        previous = self._nodes.get(node_id)
+        if previous is not None:
+            self._unindex_labels(node_id, previous.labels)
+
+        record = make_node_record(node_id, node["labels"], node["properties"])
+        self._nodes[record.id] = record
+        self._index_labels(record.id, record.labels)
+        return node
+
+    def update_node(self, node_id: str, labels: List[str], properties: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+
+        previous = self._nodes.get(node_id)
+        if previous is None:
+            return None
+
+        self._unindex_labels(node_id, previous.labels)
+        record = make_node_record(previous.id, list(labels), dict(properties))
+        self._nodes[record.id] = record
+        self._index_labels(record.id, record.labels)
+        return record.to_dict()
+
+    def remove_node(self, node_id: str) -> List[str]:
+
+        record = self._nodes.pop(node_id, None)
+        if record is None:
+            return []
+
+        self._unindex_labels(node_id, record.labels)
+
+        removed_rels = list(dict.fromkeys(list(self._outgoing.get(node_id, ())) + list(self._incoming.get(node_id, ()))))
+        for rel_id in removed_rels:
+            self.remove_rel(rel_id)
+
+        self._outgoing.pop(node_id, None)
+        self._incoming.pop(node_id, None)
+        return removed_rels
+
+    def node_ids(self) -> List[str]:
+
+        return list(self._nodes)
+
+    def node_ids_by_label(self, label: str) -> List[str]:
+
+        return list(self._labels.get(label, {}))
+
+    def label_members(self, label: str):
+
+        return self._labels.get(label, {}).keys()
+
+    def labels(self) -> List[str]:
+
+        return list(self._labels)
+
+
+    def get_rel(self, rel_id: str) -> Optional[Dict[str, Any]]:
+
+        record = self._rels.get(rel_id)
+        return record.to_dict() if record is not None else None
+
+    def get_rel_record(self, rel_id: str):
+
+        return self._rels.get(rel_id)
+
+    def add_rel(self, rel: Dict[str, Any]) -> Dict[str, Any]:
+
+        rel_id = rel["id"]
+        if rel_id in self._rels:
+            self.remove_rel(rel_id)
+
+        record = make_rel_record(rel_id, rel["source"], rel["target"], rel["type"], rel.get("properties") or {})
+        self._rels[record.id] = record
+        self._outgoing.setdefault(record.source, []).append(record.id)
+        self._incoming.setdefault(record.target, []).append(record.id)
+        return rel
+
+    def remove_rel(self, rel_id: str) -> Optional[Dict[str, Any]]:
+
+        record = self._rels.pop(rel_id, None)
+        if record is None:
+            return None
+
+        self._unlink(self._outgoing, record.source, record.id)
+        self._unlink(self._incoming, record.target, record.id)
+        return record.to_dict()
+
+    def rels_by_type(self, rel_type: str) -> Iterator[Any]:
+
+        return (record for record in self._rels.values() if record.type == rel_type)
+
+    def outgoing_records(self, node_id: str, rel_type: Optional[str] = None) -> List[Any]:
+
+        records = [self._rels[rel_id] for rel_id in self._outgoing.get(node_id, ())]
+        if rel_type:
+            records = [r for r in records if r.type == rel_type]
+        return records
+
+    def incoming_records(self, node_id: str, rel_type: Optional[str] = None) -> List[Any]:
+
+        records = [self._rels[rel_id] for rel_id in self._incoming.get(node_id, ())]
+        if rel_type:
+            records = [r for r in records if r.type == rel_type]
+        return records
+
+    def outgoing(self, node_id: str, rel_type: Optional[str] = None) -> List[Dict[str, Any]]:
+
+        return [r.to_dict() for r in self.outgoing_records(node_id, rel_type)]
+
+    def incoming(self, node_id: str, rel_type: Optional[str] = None) -> List[Dict[str, Any]]:
+
+        return [r.to_dict() for r in self.incoming_records(node_id, rel_type)]
+
+    def degree(self, node_id: str) -> int:
+
+        return len(self._outgoing.get(node_id, ())) + len(self._incoming.get(node_id, ()))
+
+
+    @staticmethod
+    def _unlink(adjacency: Dict[str, List[str]], node_id: str, rel_id: str):
+
+        rel_ids = adjacency.get(node_id)
+        if not rel_ids:
+            return
+        try:
+            rel_ids.remove(rel_id)
+        except ValueError:
+            return
+        if not rel_ids:
+            del adjacency[node_id]
+
+    def _index_labels(self, node_id: str, labels):
+
+        for label in labels:
+            self._labels.setdefault(label, {})[node_id] = None
+
+    def _unindex_labels(self, node_id: str, labels):
+
+        for label in labels:
+            ids = self._labels.get(label)
+            if ids is None:
+                continue
+            ids.pop(node_id, None)
+            if not ids:
+                del self._labels[label]
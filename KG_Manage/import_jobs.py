@@ -0,0 +1,233 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from config import Config
+from KG_Manage.import_manager import ImportCancelled
+from KG_Manage.import_validator import ImportValidator
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressReader:
+
+
+    def __init__(self, raw, job):
+        self.raw = raw
+        self.job = job
+
+    def read(self, size: int = -1) -> bytes:
+
+        data = self.raw.read(size)
+        self.job.bytes_read += len(data)
+        return data
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+
+        return self.raw.seek(offset, whence)
+
+    def tell(self) -> int:
+
+        return self.raw.tell()
+
+    def seekable(self) -> bool:
+
+        return self.raw.seekable()
+
+
+class ImportJob:
+
+
+    def __init__(self, path: str, filename: str, repository_name: str, replace_existing: bool = False):
+        self.id = uuid.uuid4().hex
+        self.path = path
+        self.filename = filename
+        self.repository_name = repository_name
+        self.replace_existing = replace_existing
+
+        self.status = "queued"
+        self.phase = "queued"
+        self.total_bytes = os.path.getsize(path)
+        self.bytes_read = 0
+        self.structures_done = 0
+        self.faces_done = 0
+        self.edges_done = 0
+        self.result = None
+        self.error = None
+        self.validation = None
+
+        self.created_at = datetime.now().isoformat()
+        self.started = None
+        self.finished = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+
+        return self._cancel.is_set()
+
+    @property
+    def finished_running(self) -> bool:
+
+        return self.status in ("completed", "failed", "cancelled")
+
+    def cancel(self):
+
+        self._cancel.set()
+
+    def set_phase(self, phase: str):
+
+        self.phase = phase
+
+    def advance(self, structures: int, faces: int, edges: int):
+
+        with self._lock:
+            self.structures_done += structures
+            self.faces_done += faces
+            self.edges_done += edges
+
+    def to_dict(self) -> Dict[str, Any]:
+
+        now = self.finished or time.monotonic()
+        elapsed = now - self.started if self.started else 0.0
+
+        throughput = self.structures_done / elapsed if elapsed > 0 else 0.0
+        byte_rate = self.bytes_read / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if self.status == "running" and byte_rate > 0:
+            eta = round(max(self.total_bytes - self.bytes_read, 0) / byte_rate, 1)
+
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "repository_name": self.repository_name,
+            "replace_existing": self.replace_existing,
+            "status": self.status,
+            "phase": self.phase,
+            "created_at": self.created_at,
+            "elapsed_seconds": round(elapsed, 1),
+            "bytes_read": self.bytes_read,
+            "total_bytes": self.total_bytes,
+            "progress": round(self.bytes_read / self.total_bytes, 4) if self.total_bytes else 1.0,
+            "structures_done": self.structures_done,
+            "faces_done": self.faces_done,
+            "edges_done": self.edges_done,
+            "structures_per_second": round(throughput, 1),
+            "eta_seconds": eta,
+            "result": self.result,
+            "error": self.error,
+            "validation": self.validation
+        }
+
+
+class ImportJobManager:
+
+
+    def __init__(self, import_manager):
+        self.import_manager = import_manager
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, Config.IMPORT_JOB_WORKERS),
+                                            thread_name_prefix="import-job")
+
+    def submit_xml(self, stream, filename: str, repository_name: str, replace_existing: bool = False) -> Dict[str, Any]:
+
+        fd, path = tempfile.mkstemp(prefix="kg-import-", suffix=".upload", dir=Config.IMPORT_UPLOAD_DIR)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while True:
+                    block = stream.read(1024 * 1024)
+                    if not block:
+                        break
+                    f.write(block)
+        except Exception:
+            os.remove(path)
+            raise
+
+        job = ImportJob(path, filename, repository_name, replace_existing)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim_history()
+        self._executor.submit(self._run, job)
+
+        logger.info(f"Queued import job {job.id} for {filename} ({job.total_bytes} bytes)")
+        return job.to_dict()
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+
+        job = self._jobs.get(job_id)
+        return job.to_dict() if job is not None else None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job.to_dict() for job in reversed(jobs)]
+
+    def cancel_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if not job.finished_running:
+            job.cancel()
+            logger.info(f"Cancellation requested for import job {job.id}")
+        return job.to_dict()
+
+    def _run(self, job: ImportJob):
+
+        if job.cancelled:
+            job.status = job.phase = "cancelled"
+            self._cleanup(job)
+            return
+
+        job.status = "running"
+        job.started = time.monotonic()
+        try:
+            if Config.IMPORT_VALIDATE:
+                job.phase = "validating"
+                with open(job.path, "rb") as f:
+                    job.validation = ImportValidator().validate_upload(f, job.filename)
+                if not job.validation["valid"]:
+                    raise Exception(f"XML validation failed: {job.validation['errors']} errors")
+                if job.cancelled:
+                    raise ImportCancelled("Import cancelled")
+
+            job.phase = "parsing"
+            with open(job.path, "rb") as f:
+                job.result = self.import_manager.import_from_upload(ProgressReader(f, job), job.filename,
+                                                                    job.repository_name, job, job.replace_existing)
+            job.status = "completed"
+            job.phase = "done"
+        except ImportCancelled:
+            job.status = job.phase = "cancelled"
+            logger.info(f"Import job {job.id} cancelled")
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.error(f"Import job {job.id} failed: {e}")
+        finally:
+            job.finished = time.monotonic()
+            self._cleanup(job)
+
+    def _cleanup(self, job: ImportJob):
+
+        try:
+            os.remove(job.path)
+        except OSError as e:
+            logger.warning(f"Failed to remove import upload {job.path}: {e}")
+
+    def _trim_history(self):
+
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished_running]
+        excess = len(self._jobs) - Config.IMPORT_JOB_HISTORY
+        for job_id in finished[:max(excess, 0)]:
+            del self._jobs[job_id]
@@ -1,13 +1,23 @@
+import hashlib
+import io
 import json
 import xml.etree.ElementTree as ET
 import logging
 import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+from config import Config
+from KG_Manage.compression import iter_xml_sources
 
 logger = logging.getLogger(__name__)
 
 
+class ImportCancelled(Exception):
+    pass
+
+
 class ImportManager:
 
 
@@ -20,45 +30,31 @@ class ImportManager:
         if not self.graph:
             raise Exception("Database not connected")
 
+        import_token = uuid.uuid4().hex
+        import_keys = []
+        delta = self._new_delta()
+        created_nodes = 0
+        created_rels = 0
+        skipped_rels = 0
+
         try:
             logger.info("Starting data validation and cleaning...")
-            id_map = {}
-            created_nodes = 0
-            created_rels = 0
-            skipped_rels = 0
-
 
             nodes_data = data.get("nodes", [])
             logger.info(f"Prepare to import {len(nodes_data)} Nodes")
 
-            for i, node_data in enumerate(nodes_data):
-                try:
-                    labels = node_data.get("labels") or ["Node"]
-                    props = dict(node_data.get("properties") or {})
-
-
-                    props = {k: v for k, v in props.items() if v != "" and v is not None}
-
-                    labels_str = "".join([f":`{label}`" for label in labels])
-                    query = f"CREATE (m{labels_str}) SET m += $p RETURN elementId(m) AS id"
-
-                    cursor = self.graph.run(query, p=props)
-                    new_id = cursor.evaluate()
-
-                    if new_id:
-                        old_id = node_data.get("id")
-                        if old_id:
-                            id_map[old_id] = new_id
-                        created_nodes += 1
-
-                        if (i + 1) % 10 == 0:
-                            logger.info(f"Created {i + 1}/{len(nodes_data)} Nodes")
-                    else:
-                        logger.warning(f"Node creation failed: {node_data}")
-
-                except Exception as e:
-                    logger.error(f"Error creating node: {e}, Node data: {node_data}")
-                    continue
+            node_ids = set()
+            batch = []
+            for node in self._iter_clean_nodes(nodes_data):
+                node_ids.add(node["id"])
+                import_keys.append(f"{import_token}:{node['id']}")
+                batch.append(node)
+                if len(batch) >= Config.IMPORT_BATCH_SIZE:
+                    created_nodes += self._create_node_batch(batch, import_token, delta)
+                    batch = []
+                    logger.info(f"Created {created_nodes}/{len(nodes_data)} Nodes")
+            if batch:
+                created_nodes += self._create_node_batch(batch, import_token, delta)
 
             logger.info(f"Node import completed: {created_nodes}/{len(nodes_data)}")
 
@@ -66,61 +62,24 @@ class ImportManager:
             rels_data = data.get("relationships", [])
             logger.info(f"Prepare to import {len(rels_data)} Relationships")
 
-
-            created_rel_pairs = set()
-
-            for i, rel_data in enumerate(rels_data):
-                try:
-                    old_source = rel_data.get("source")
-                    old_target = rel_data.get("target")
-                    rel_type = rel_data.get("type") or "RELATED"
-                    props = dict(rel_data.get("properties") or {})
-
-
-                    props = {k: v for k, v in props.items() if v != "" and v is not None}
-
-
-                    if old_source not in id_map or old_target not in id_map:
-                        logger.warning(f"Skip relationship: node does not exist {old_source} -> {old_target}")
-                        skipped_rels += 1
-                        continue
-
-                    new_source = id_map[old_source]
-                    new_target = id_map[old_target]
-
-
-                    if new_source == new_target:
-                        logger.warning(f"Skip self-loop relationship: {rel_type} on {new_source}")
-                        skipped_rels += 1
-                        continue
-
-
-
-                    safe_rel_type = rel_type.replace('`', '').replace("'", "").replace('"', '')
-
-                    query = f"""
-                        MATCH (x) WHERE elementId(x) = $a 
-                        MATCH (y) WHERE elementId(y) = $b 
-                        CREATE (x)-[rel:`{safe_rel_type}`]->(y) 
-                        SET rel += $p
-                        """
-
-                    self.graph.run(query, a=new_source, b=new_target, p=props)
-
-                    created_rels += 1
-
-                    if (i + 1) % 50 == 0:
-                        logger.info(f"Processed {i + 1}/{len(rels_data)} Relationships")
-
-                except Exception as e:
-                    logger.error(f"Error creating relationship: {e}, Relational data: {rel_data}")
-                    skipped_rels += 1
-                    continue
-
+            batch = []
+            for rel in self._iter_clean_rels(rels_data, node_ids):
+                batch.append(rel)
+                if len(batch) >= Config.IMPORT_BATCH_SIZE:
+                    created_rels += self._create_rel_batch(batch, import_token, delta)
+                    batch = []
+                    logger.info(f"Processed {created_rels}/{len(rels_data)} Relationships")
+            if batch:
+                created_rels += self._create_rel_batch(batch, import_token, delta)
+
+            skipped_rels = len(rels_data) - created_rels
             logger.info(f"Relationship import completed: Create {created_rels}，Skip {skipped_rels}")
 
+            self._clear_import_keys(import_keys)
+            import_keys.clear()
+
 
-            self.data_loader.reload_db()
+            self.data_loader.apply_delta(delta)
 
             logger.info(f"Import Complete - Node: {created_nodes}, Relationship: {created_rels}, Skip: {skipped_rels}")
             return True
@@ -128,61 +87,172 @@ class ImportManager:
         except Exception as e:
             logger.error(f"Error importing data: {e}")
             logger.error(f"Full error message: {traceback.format_exc()}")
+            if import_keys:
+                logger.info(f"Rolling back {len(import_keys)} imported nodes")
+                self._clear_import_keys(import_keys, delete=True)
+                import_keys.clear()
             raise e
 
+        finally:
+            self._clear_import_keys(import_keys)
+
     def clean_import_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
 
-        cleaned_data = {
-            "nodes": [],
-            "relationships": []
+        nodes = list(self._iter_clean_nodes(data.get("nodes", [])))
+        node_ids = {node["id"] for node in nodes}
+        return {
+            "nodes": nodes,
+            "relationships": list(self._iter_clean_rels(data.get("relationships", []), node_ids))
         }
 
+    @staticmethod
+    def _iter_clean_nodes(nodes: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
 
         seen_node_ids = set()
-        for node in data.get("nodes", []):
+        for node in nodes:
             node_id = node.get("id")
-            if node_id and node_id not in seen_node_ids:
-
-                props = node.get("properties", {})
-                cleaned_props = {k: v for k, v in props.items() if v != "" and v is not None}
-
-                cleaned_node = {
-                    "id": node_id,
-                    "labels": node.get("labels", ["Node"]),
-                    "properties": cleaned_props
-                }
-                cleaned_data["nodes"].append(cleaned_node)
-                seen_node_ids.add(node_id)
+            if not node_id or node_id in seen_node_ids:
+                continue
+            seen_node_ids.add(node_id)
+
+            props = node.get("properties") or {}
+            yield {
+                "id": node_id,
+                "labels": node.get("labels") or ["Node"],
+                "properties": {k: v for k, v in props.items() if v != "" and v is not None and k != "uuid"}
+            }
 
+    @staticmethod
+    def _iter_clean_rels(rels: Iterable[Dict[str, Any]], node_ids: set) -> Iterator[Dict[str, Any]]:
 
         seen_rels = set()
-        node_ids = {node["id"] for node in cleaned_data["nodes"]}
-
-        for rel in data.get("relationships", []):
+        for rel in rels:
             source = rel.get("source")
             target = rel.get("target")
-            rel_type = rel.get("type", "RELATED")
+            rel_type = rel.get("type") or "RELATED"
+
+            if source not in node_ids or target not in node_ids or source == target:
+                continue
+
+            rel_key = (source, target, rel_type)
+            if rel_key in seen_rels:
+                continue
+            seen_rels.add(rel_key)
+
+            props = rel.get("properties") or {}
+            yield {
+                "source": source,
+                "target": target,
+                "type": rel_type,
+                "properties": {k: v for k, v in props.items() if v != "" and v is not None}
+            }
+
+    def _create_node_batch(self, nodes: List[Dict[str, Any]], import_token: str, delta: Dict[str, List]) -> int:
+
+        groups = {}
+        for node in nodes:
+            groups.setdefault(tuple(node["labels"]), []).append(node)
+
+        def write(tx):
+            created = []
+            for labels, group in groups.items():
+                labels_str = "".join([f":`{label.replace('`', '')}`" for label in labels])
+                query = f"""
+                UNWIND $rows AS row
+                CREATE (m{labels_str}:_ImportBatch)
+                SET m += row.props, m._import_key = row.key
+                RETURN elementId(m) AS id
+                """
+                rows = [{
+                    "key": f"{import_token}:{node['id']}",
+                    "props": dict(node["properties"], uuid=str(uuid.uuid4()))
+                } for node in group]
+                for row, record in zip(rows, tx.run(query, rows=rows).data()):
+                    created.append({"id": record["id"], "labels": list(labels), "properties": row["props"]})
+            return created
+
+        created = self.graph.run_in_transaction(write)
+        delta["nodes"].extend(created)
+        return len(created)
+
+    def _create_rel_batch(self, rels: List[Dict[str, Any]], import_token: str, delta: Dict[str, List]) -> int:
+
+        groups = {}
+        for rel in rels:
+            groups.setdefault(rel["type"], []).append(rel)
+
+        def write(tx):
+            created = []
+            for rel_type, group in groups.items():
+                safe_rel_type = rel_type.replace('`', '').replace("'", "").replace('"', '')
+                query = f"""
+                UNWIND $rows AS row
+                MATCH (x:_ImportBatch {{_import_key: row.source}})
+                MATCH (y:_ImportBatch {{_import_key: row.target}})
+                CREATE (x)-[rel:`{safe_rel_type}`]->(y)
+                SET rel += row.props
+                RETURN row.index AS index, elementId(rel) AS id, elementId(x) AS source, elementId(y) AS target
+                """
+                rows = [{
+                    "index": index,
+                    "source": f"{import_token}:{rel['source']}",
+                    "target": f"{import_token}:{rel['target']}",
+                    "props": rel["properties"]
+                } for index, rel in enumerate(group)]
+                for record in tx.run(query, rows=rows).data():
+                    created.append({
+                        "id": record["id"],
+                        "source": record["source"],
+                        "target": record["target"],
+                        "type": safe_rel_type,
+                        "properties": group[record["index"]]["properties"]
+                    })
+            return created
+
+        created = self.graph.run_in_transaction(write)
+        delta["relationships"].extend(created)
+        return len(created)
+
+    def _clear_import_keys(self, import_keys: List[str], delete: bool = False):
+
+        action = "DETACH DELETE n" if delete else "REMOVE n:_ImportBatch, n._import_key"
+        query = f"""
+        UNWIND $keys AS key
+        MATCH (n:_ImportBatch {{_import_key: key}})
+        {action}
+        """
+
+        for start in range(0, len(import_keys), Config.IMPORT_ROLLBACK_BATCH_SIZE):
+            try:
+                self.graph.run(query, keys=import_keys[start:start + Config.IMPORT_ROLLBACK_BATCH_SIZE])
+            except Exception as e:
+                logger.warning(f"Failed to {'delete' if delete else 'clear'} temporarily keyed import nodes: {e}")
 
+    def import_from_xml(self, xml_content: str, repository_name: str = None,
+                        replace_existing: bool = False) -> Dict[str, int]:
 
-            if source in node_ids and target in node_ids and source != target:
-                rel_key = (source, target, rel_type)
-                if rel_key not in seen_rels:
+        return self.import_from_xml_file(io.StringIO(xml_content), repository_name, replace_existing=replace_existing)
 
-                    props = rel.get("properties", {})
-                    cleaned_props = {k: v for k, v in props.items() if v != "" and v is not None}
+    def import_from_upload(self, raw, filename: str, repository_name: str = None, progress=None,
+                           replace_existing: bool = False) -> Dict[str, Any]:
 
-                    cleaned_rel = {
-                        "source": source,
-                        "target": target,
-                        "type": rel_type,
-                        "properties": cleaned_props
-                    }
-                    cleaned_data["relationships"].append(cleaned_rel)
-                    seen_rels.add(rel_key)
+        results = []
+        for name, source in iter_xml_sources(raw, filename):
+            if progress is not None and progress.cancelled:
+                raise ImportCancelled()
+            logger.info(f"Importing {name} from {filename}")
+            results.append((name, self.import_from_xml_file(source, repository_name, progress, replace_existing)))
 
-        return cleaned_data
+        if len(results) == 1:
+            return results[0][1]
 
-    def import_from_xml(self, xml_content: str, repository_name: str = None) -> Dict[str, int]:
+        combined = {key: sum(result.get(key, 0) for _, result in results)
+                    for key, value in results[0][1].items() if isinstance(value, int)}
+        combined["files"] = [dict(result, file=name) for name, result in results]
+        return combined
+
+    def import_from_xml_file(self, source, repository_name: str = None, progress=None,
+                             replace_existing: bool = False) -> Dict[str, int]:
 
         if not self.graph:
             raise Exception("Database not connected")
@@ -190,29 +260,66 @@ class ImportManager:
         try:
             logger.info("Start XML data import...")
 
-
+            events = ET.iterparse(source, events=("start", "end"))
             try:
-                root = ET.fromstring(xml_content)
+                _, root = next(events)
             except ET.ParseError as e:
                 raise Exception(f"XML format error: {e}")
+            except StopIteration:
+                raise Exception("XML format error: empty document")
 
 
             if root.tag == "StandardFeatureStructure":
-                return self._import_standard_feature_structure(root, repository_name)
+                return self._import_standard_feature_structure(self.iter_structures(events, root), repository_name,
+                                                               progress, replace_existing)
             elif root.tag == "Neo4jGraphData":
+                try:
+                    for _ in events:
+                        pass
+                except ET.ParseError as e:
+                    raise Exception(f"XML format error: {e}")
                 return self._import_neo4j_graph_data(root, repository_name)
             else:
                 raise Exception(f"Unsupported XML format, the root element is: {root.tag}")
 
+        except ImportCancelled:
+            raise
         except Exception as e:
             logger.error(f"XML import failed: {e}")
             raise e
 
-    def _import_standard_feature_structure(self, root: ET.Element, repository_name: str = None) -> Dict[str, int]:
+    @staticmethod
+    def iter_structures(events, root: ET.Element) -> Iterator[Dict[str, Any]]:
 
-        created_nodes = 0
-        created_rels = 0
-        skipped_rels = 0
+        depth = 1
+        try:
+            for event, elem in events:
+                if event == "start":
+                    depth += 1
+                    continue
+
+                depth -= 1
+                if depth == 1:
+                    if elem.tag == "Structure":
+                        yield ImportManager.parse_structure(elem)
+                    root.clear()
+        except ET.ParseError as e:
+            raise Exception(f"XML format error: {e}")
+
+    def _import_standard_feature_structure(self, structures: Iterable[Dict[str, Any]], repository_name: str = None,
+                                           progress=None, replace_existing: bool = False) -> Dict[str, int]:
+
+        counts = {
+            "nodes_created": 0,
+            "relationships_created": 0,
+            "relationships_skipped": 0,
+            "structures_skipped": 0,
+            "structures_replaced": 0
+        }
+        delta = self._new_delta()
+        import_id = uuid.uuid4().hex
+        replaced_ids = []
+        written_ids = []
 
         try:
 
@@ -221,159 +328,440 @@ class ImportManager:
                 repository_props = {
                     "name": repository_name,
                     "type": "Repository",
-                    "created_at": datetime.now().isoformat()
+                    "created_at": datetime.now().isoformat(),
+                    "uuid": str(uuid.uuid4())
                 }
 
 
-                repo_query = "CREATE (r:Repository) SET r += $props RETURN elementId(r) AS id"
-                repo_cursor = self.graph.run(repo_query, props=repository_props)
-                repository_id = repo_cursor.evaluate()
-                if repository_id:
-                    created_nodes += 1
+                repo_query = """
+                MERGE (r:Repository {name: $props.name})
+                ON CREATE SET r += $props, r.import_id = $import_id
+                RETURN elementId(r) AS id, r.uuid = $props.uuid AS created
+                """
+                repo_row = self.graph.run(repo_query, props=repository_props, import_id=import_id).data()[0]
+                repository_id = repo_row["id"]
+                if repo_row["created"]:
+                    written_ids.append(repository_id)
+                    counts["nodes_created"] += 1
+                    delta["nodes"].append({"id": repository_id, "labels": ["Repository"], "properties": repository_props})
                     logger.info(f"Creating a Repository Node: {repository_id}")
+                else:
+                    logger.info(f"Importing into existing Repository Node: {repository_id}")
 
+                existing = self._get_structure_hashes(repository_id)
+                structures = self._dedupe_structures(structures, existing, counts, progress, replace_existing)
 
-            for structure_elem in root.findall("Structure"):
-                structure_no = structure_elem.get("StructureNo", "1")
-                structure_name = structure_elem.get("StructureName", "")
-                structure_english_name = structure_elem.get("StructureEnglishName", "")
-
-
-                structure_labels = [structure_english_name] if structure_english_name else ["Structure"]
-                structure_props = {
-                    "structure_no": structure_no,
-                    "structure_name": structure_name,
-                    "structure_english_name": structure_english_name
-                }
-
-                labels_str = "".join([f":`{label}`" for label in structure_labels])
-                query = f"CREATE (n{labels_str}) SET n += $props RETURN elementId(n) AS id"
-                cursor = self.graph.run(query, props=structure_props)
-                structure_id = cursor.evaluate()
-
-                if structure_id:
-                    created_nodes += 1
-                    logger.info(f"Create the main structure node: {structure_id}")
-
-
-                    if repository_id and structure_id:
-                        has_structure_query = """
-                        MATCH (r) WHERE elementId(r) = $repository_id
-                        MATCH (s) WHERE elementId(s) = $structure_id
-                        CREATE (r)-[:HAS_STRUCTURE]->(s)
-                        """
-                        self.graph.run(has_structure_query, repository_id=repository_id, structure_id=structure_id)
-                        created_rels += 1
-
-
-                face_list = structure_elem.find("FaceList")
-                face_id_map = {}
-
-                if face_list is not None:
-                    for face_elem in face_list.findall("Face"):
-                        face_no = face_elem.get("FaceNo", "0")
-
-
-                        face_props = {
-                            "face_no": face_no,
-                            "face_type": face_elem.get("FaceType", "0"),
-                            "outter_loop_size": face_elem.get("OutterLoopSize", "1"),
-                            "inner_loop_size": face_elem.get("InnerLoopSize", "0"),
-                            "is_convex_surface": face_elem.get("IsConvexSurface", "0"),
-                            "structure_no": structure_no,
-                            "structure_english_name": structure_english_name,
-                            "color": "#000000"
-                        }
 
+            if progress is not None:
+                progress.set_phase("writing")
+            structure_ids = self._write_structures_parallel(structures, counts, delta, import_id, replaced_ids,
+                                                            written_ids, progress)
 
-                        if face_props["inner_loop_size"] == "":
-                            face_props["inner_loop_size"] = "0"
+            if progress is not None and progress.cancelled:
+                raise ImportCancelled("Import cancelled")
 
+            if repository_id or structure_ids or replaced_ids:
+                if progress is not None:
+                    progress.set_phase("linking")
+                links, removed = self._finalize_structures(repository_id, structure_ids, replaced_ids, import_id)
+                counts["relationships_created"] += len(links)
+                delta["relationships"].extend(links)
+                delta["removed_node_ids"].extend(removed)
 
-                        face_query = "CREATE (f:Face) SET f += $props RETURN elementId(f) AS id"
-                        face_cursor = self.graph.run(face_query, props=face_props)
-                        face_id = face_cursor.evaluate()
 
-                        if face_id:
-                            face_id_map[face_no] = face_id
-                            created_nodes += 1
+            if progress is not None:
+                progress.set_phase("updating cache")
+            self.data_loader.apply_delta(delta)
 
+            logger.info(
+                f"StandardFeatureStructure import completed - Node: {counts['nodes_created']}, "
+                f"Relationship: {counts['relationships_created']}, Skip: {counts['relationships_skipped']}")
+            return counts
 
-                            if structure_id:
-                                has_face_query = """
-                                MATCH (s) WHERE elementId(s) = $structure_id
-                                MATCH (f) WHERE elementId(f) = $face_id
-                                CREATE (s)-[:HAS_FACE]->(f)
-                                """
-                                self.graph.run(has_face_query, structure_id=structure_id, face_id=face_id)
-                                created_rels += 1
-
-
-                rel_list = structure_elem.find("EdgeList")
-                if rel_list is None:
-
-                    rel_list = structure_elem.find("RelationShipList")
-
-                if rel_list is not None:
+        except Exception as e:
+            if isinstance(e, ImportCancelled):
+                logger.info(f"StandardFeatureStructure import {import_id} cancelled, rolling back")
+            else:
+                logger.error(f"StandardFeatureStructure import {import_id} failed, rolling back: {e}")
+            if progress is not None:
+                progress.set_phase("rolling back")
+            self.rollback_import(import_id, written_ids)
+            raise e
 
-                    rel_elements = rel_list.findall("Edge")
-                    if not rel_elements:
+    def rollback_import(self, import_id: str, node_ids: List[str]) -> int:
+
+        face_query = """
+        MATCH (f:Face) WHERE f.import_id = $import_id
+        WITH f LIMIT $batch_size
+        DETACH DELETE f
+        RETURN count(*) AS deleted
+        """
+        node_query = """
+        UNWIND $node_ids AS node_id
+        MATCH (n) WHERE elementId(n) = node_id AND n.import_id = $import_id
+        DETACH DELETE n
+        RETURN count(*) AS deleted
+        """
+
+        deleted = 0
+        try:
+            while True:
+                batch = self.graph.evaluate(face_query, import_id=import_id,
+                                            batch_size=Config.IMPORT_ROLLBACK_BATCH_SIZE) or 0
+                deleted += batch
+                if batch < Config.IMPORT_ROLLBACK_BATCH_SIZE:
+                    break
+            for start in range(0, len(node_ids), Config.IMPORT_ROLLBACK_BATCH_SIZE):
+                deleted += self.graph.evaluate(node_query, import_id=import_id,
+                                               node_ids=node_ids[start:start + Config.IMPORT_ROLLBACK_BATCH_SIZE]) or 0
+        except Exception as e:
+            logger.error(f"Rollback of import {import_id} failed after deleting {deleted} nodes: {e}")
+            return deleted
+
+        logger.info(f"Rolled back import {import_id}: deleted {deleted} nodes")
+        return deleted
+
+    @staticmethod
+    def parse_structure(structure_elem: ET.Element) -> Dict[str, Any]:
+
+        structure_no = structure_elem.get("StructureNo", "1")
+        structure_name = structure_elem.get("StructureName", "")
+        structure_english_name = structure_elem.get("StructureEnglishName", "")
+
+        structure = {
+            "labels": [structure_english_name] if structure_english_name else ["Structure"],
+            "props": {
+                "structure_no": structure_no,
+                "structure_name": structure_name,
+                "structure_english_name": structure_english_name
+            },
+            "faces": [],
+            "edges": [],
+            "skipped": 0
+        }
 
-                        rel_elements = rel_list.findall("RelationShip")
 
-                    for rel_elem in rel_elements:
-                        source_face_no = rel_elem.get("SourceFaceNo")
-                        target_face_no = rel_elem.get("TargetFaceNo")
+        face_list = structure_elem.find("FaceList")
+        face_index = {}
 
-                        if source_face_no in face_id_map and target_face_no in face_id_map:
-                            source_id = face_id_map[source_face_no]
-                            target_id = face_id_map[target_face_no]
+        if face_list is not None:
+            for face_elem in face_list.findall("Face"):
+                face_no = face_elem.get("FaceNo", "0")
 
+                face_props = {
+                    "face_no": face_no,
+                    "face_type": face_elem.get("FaceType", "0"),
+                    "outter_loop_size": face_elem.get("OutterLoopSize", "1"),
+                    "inner_loop_size": face_elem.get("InnerLoopSize", "0"),
+                    "is_convex_surface": face_elem.get("IsConvexSurface", "0"),
+                    "structure_no": structure_no,
+                    "structure_english_name": structure_english_name,
+                    "color": "#000000"
+                }
 
-                            if source_id == target_id:
-                                skipped_rels += 1
-                                continue
+                if face_props["inner_loop_size"] == "":
+                    face_props["inner_loop_size"] = "0"
 
+                face_index[face_no] = len(structure["faces"])
+                structure["faces"].append(face_props)
 
-                            rel_props = {
-                                "is_intersection": rel_elem.get("IsIntersection", "1"),
-                                "is_parallel": rel_elem.get("IsParallel", "0"),
-                                "is_vertical": rel_elem.get("IsVertical", "1"),
-                                "is_convexity": rel_elem.get("IsConvexity", "-1"),
-                                "size_edge_intersection": rel_elem.get("SizeEdgeIntersection", "1"),
-                                "relationship_type": rel_elem.get("RelationShipType", "1"),
-                                "flag_angle_degree": rel_elem.get("FlagAngleDegree", "1"),
-                                "color": "#000000"
-                            }
 
+        rel_list = structure_elem.find("EdgeList")
+        if rel_list is None:
+            rel_list = structure_elem.find("RelationShipList")
 
-                            if rel_props["size_edge_intersection"] == "":
-                                rel_props["size_edge_intersection"] = "1"
+        if rel_list is not None:
+            rel_elements = rel_list.findall("Edge")
+            if not rel_elements:
+                rel_elements = rel_list.findall("RelationShip")
 
+            for rel_elem in rel_elements:
+                source_face_no = rel_elem.get("SourceFaceNo")
+                target_face_no = rel_elem.get("TargetFaceNo")
 
-                            rel_query = """
-                            MATCH (a) WHERE elementId(a) = $source_id
-                            MATCH (b) WHERE elementId(b) = $target_id
-                            CREATE (a)-[r:RELATIONSHIP]->(b)
-                            SET r += $props
-                            """
-                            self.graph.run(rel_query, source_id=source_id, target_id=target_id, props=rel_props)
-                            created_rels += 1
-                        else:
-                            skipped_rels += 1
-                            logger.warning(f"Skip relationship: Face node does not exist {source_face_no} -> {target_face_no}")
+                if source_face_no not in face_index or target_face_no not in face_index:
+                    structure["skipped"] += 1
+                    logger.warning(f"Skip relationship: Face node does not exist {source_face_no} -> {target_face_no}")
+                    continue
 
+                if face_index[source_face_no] == face_index[target_face_no]:
+                    structure["skipped"] += 1
+                    continue
 
-            self.data_loader.reload_db()
+                rel_props = {
+                    "is_intersection": rel_elem.get("IsIntersection", "1"),
+                    "is_parallel": rel_elem.get("IsParallel", "0"),
+                    "is_vertical": rel_elem.get("IsVertical", "1"),
+                    "is_convexity": rel_elem.get("IsConvexity", "-1"),
+                    "size_edge_intersection": rel_elem.get("SizeEdgeIntersection", "1"),
+                    "relationship_type": rel_elem.get("RelationShipType", "1"),
+                    "flag_angle_degree": rel_elem.get("FlagAngleDegree", "1"),
+                    "color": "#000000"
+                }
 
-            logger.info(
-                f"StandardFeatureStructure import completed - Node: {created_nodes}, Relationship: {created_rels}, Skip: {skipped_rels}")
-            return {
-                "nodes_created": created_nodes,
-                "relationships_created": created_rels,
-                "relationships_skipped": skipped_rels
-            }
+                if rel_props["size_edge_intersection"] == "":
+                    rel_props["size_edge_intersection"] = "1"
+
+                structure["edges"].append({
+                    "source": face_index[source_face_no],
+                    "target": face_index[target_face_no],
+                    "props": rel_props
+                })
+
+        structure["props"]["content_hash"] = ImportManager._content_hash(structure)
+        return structure
+
+    @staticmethod
+    def _content_hash(structure: Dict[str, Any]) -> str:
+
+        faces = structure["faces"]
+        payload = {
+            "labels": structure["labels"],
+            "structure": {k: v for k, v in structure["props"].items() if k != "content_hash"},
+            "faces": sorted(faces, key=lambda face: json.dumps(face, sort_keys=True)),
+            "edges": sorted(
+                [[faces[edge["source"]]["face_no"], faces[edge["target"]]["face_no"], edge["props"]]
+                 for edge in structure["edges"]],
+                key=lambda edge: json.dumps(edge, sort_keys=True)
+            )
+        }
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _get_structure_hashes(self, repository_id: str) -> Dict[tuple, Dict[str, Any]]:
+
+        query = """
+        MATCH (r)-[:HAS_STRUCTURE]->(s) WHERE elementId(r) = $repository_id
+        RETURN elementId(s) AS id, s.structure_no AS structure_no,
+               s.structure_english_name AS structure_english_name, s.content_hash AS content_hash
+        """
+
+        existing = {}
+        for record in self.graph.query(query, repository_id=repository_id):
+            key = (record["structure_no"], record["structure_english_name"])
+            existing.setdefault(key, []).append({"id": record["id"], "content_hash": record["content_hash"]})
+        return existing
+
+    def _dedupe_structures(self, structures: Iterable[Dict[str, Any]], existing: Dict[tuple, List[Dict[str, Any]]],
+                           counts: Dict[str, int], progress=None,
+                           replace_existing: bool = False) -> Iterator[Dict[str, Any]]:
+
+        known_hashes = {p["content_hash"] for previous in existing.values() for p in previous}
+        for structure in structures:
+            key = (structure["props"]["structure_no"], structure["props"]["structure_english_name"])
+            previous = existing.pop(key, None) if replace_existing else None
+
+            content_hash = structure["props"]["content_hash"]
+            if content_hash in known_hashes:
+                counts["structures_skipped"] += 1
+                if progress is not None:
+                    progress.advance(1, 0, 0)
+                continue
+            known_hashes.add(content_hash)
+
+            if previous:
+                structure["replaces"] = [p["id"] for p in previous]
+                counts["structures_replaced"] += 1
+            yield structure
+
+    def _write_structures_parallel(self, structures: Iterable[Dict[str, Any]], counts: Dict[str, int],
+                                   delta: Dict[str, List], import_id: str, replaced_ids: List[str],
+                                   written_ids: List[str], progress=None) -> List[str]:
+
+        workers = max(1, Config.IMPORT_WORKERS)
+        structure_ids = []
+
+        def collect(futures):
+            for future in futures:
+                results, skipped = future.result()
+                faces = edges = 0
+                for structure, row in results:
+                    structure_ids.append(row["id"])
+                    faces += len(row["face_ids"])
+                    edges += len(row["edge_ids"])
+                    self._add_structure_delta(delta, structure, row)
+
+                counts["nodes_created"] += len(results) + faces
+                counts["relationships_created"] += faces + edges
+                counts["relationships_skipped"] += skipped
+                if progress is not None:
+                    progress.advance(len(results), faces, edges)
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="xml-import")
+        pending = set()
+        try:
+            chunk = []
+            for structure in structures:
+                if progress is not None and progress.cancelled:
+                    raise ImportCancelled("Import cancelled")
+                chunk.append(structure)
+                replaced_ids.extend(structure.get("replaces", ()))
+                if len(chunk) < Config.IMPORT_CHUNK_SIZE:
+                    continue
 
-        except Exception as e:
-            logger.error(f"StandardFeatureStructure import failed: {e}")
-            raise e
\ No newline at end of file
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending.add(executor.submit(self._write_structures, chunk, import_id, written_ids, progress))
+                chunk = []
+
+            if progress is not None and progress.cancelled:
+                raise ImportCancelled("Import cancelled")
+            if chunk:
+                pending.add(executor.submit(self._write_structures, chunk, import_id, written_ids, progress))
+
+            done, pending = wait(pending)
+            collect(done)
+        except Exception:
+            for future in pending:
+                future.cancel()
+            raise
+        finally:
+            executor.shutdown(wait=True)
+
+        logger.info(f"Wrote {len(structure_ids)} structures with {workers} workers")
+        return structure_ids
+
+    def _write_structures(self, structures: List[Dict[str, Any]], import_id: str, written_ids: List[str],
+                          progress=None):
+
+        groups = {}
+        for structure in structures:
+            groups.setdefault(tuple(structure["labels"]), []).append({
+                "labels": structure["labels"],
+                "props": dict(structure["props"], uuid=str(uuid.uuid4())),
+                "faces": [dict(face, uuid=str(uuid.uuid4())) for face in structure["faces"]],
+                "edges": structure["edges"]
+            })
+
+        def write(tx):
+            results = []
+            for labels, group in groups.items():
+                if progress is not None and progress.cancelled:
+                    raise ImportCancelled("Import cancelled")
+                rows = tx.run(self._structure_write_query(labels), structures=group, import_id=import_id).data()
+                results.extend(zip(group, rows))
+            return results
+
+        results = self.graph.run_in_transaction(write)
+        written_ids.extend(row["id"] for _, row in results)
+        return results, sum(structure["skipped"] for structure in structures)
+
+    @staticmethod
+    def _new_delta() -> Dict[str, List]:
+
+        return {"nodes": [], "relationships": [], "removed_node_ids": []}
+
+    @staticmethod
+    def _add_structure_delta(delta: Dict[str, List], structure: Dict[str, Any], row: Dict[str, Any]):
+
+        structure_id = row["id"]
+        face_ids = row["face_ids"]
+
+        delta["nodes"].append({"id": structure_id, "labels": list(structure["labels"]), "properties": structure["props"]})
+        for face, face_id, has_face_id in zip(structure["faces"], face_ids, row["has_face_ids"]):
+            delta["nodes"].append({"id": face_id, "labels": ["Face"], "properties": face})
+            delta["relationships"].append({
+                "id": has_face_id,
+                "source": structure_id,
+                "target": face_id,
+                "type": "HAS_FACE",
+                "properties": {}
+            })
+        for edge, edge_id in zip(structure["edges"], row["edge_ids"]):
+            delta["relationships"].append({
+                "id": edge_id,
+                "source": face_ids[edge["source"]],
+                "target": face_ids[edge["target"]],
+                "type": "RELATIONSHIP",
+                "properties": edge["props"]
+            })
+
+    def _finalize_structures(self, repository_id: Optional[str], structure_ids: List[str], replaced_ids: List[str],
+                             import_id: str):
+
+        link_query = """
+        MATCH (r) WHERE elementId(r) = $repository_id
+        UNWIND $structure_ids AS structure_id
+        MATCH (s) WHERE elementId(s) = structure_id
+        CREATE (r)-[h:HAS_STRUCTURE]->(s)
+        RETURN elementId(h) AS id, structure_id
+        """
+        delete_query = """
+        UNWIND $structure_ids AS structure_id
+        MATCH (s) WHERE elementId(s) = structure_id
+        OPTIONAL MATCH (s)-[:HAS_FACE]->(f:Face)
+        WITH s, structure_id, collect(f) AS faces
+        WITH s, structure_id, faces, [f IN faces | elementId(f)] AS face_ids
+        FOREACH (f IN faces | DETACH DELETE f)
+        DETACH DELETE s
+        RETURN structure_id, face_ids
+        """
+        clear_query = """
+        UNWIND $structure_ids AS structure_id
+        MATCH (s) WHERE elementId(s) = structure_id
+        REMOVE s.import_id
+        WITH s
+        MATCH (s)-[:HAS_FACE]->(f:Face)
+        REMOVE f.import_id
+        """
+        clear_repository_query = """
+        MATCH (r) WHERE elementId(r) = $repository_id AND r.import_id = $import_id
+        REMOVE r.import_id
+        """
+
+        def finalize(tx):
+            links = []
+            removed = []
+            for start in range(0, len(structure_ids), Config.IMPORT_CHUNK_SIZE):
+                batch = structure_ids[start:start + Config.IMPORT_CHUNK_SIZE]
+                tx.run(clear_query, structure_ids=batch)
+            if repository_id:
+                tx.run(clear_repository_query, repository_id=repository_id, import_id=import_id)
+
+            if repository_id:
+                for start in range(0, len(structure_ids), Config.IMPORT_CHUNK_SIZE):
+                    batch = structure_ids[start:start + Config.IMPORT_CHUNK_SIZE]
+                    for record in tx.run(link_query, repository_id=repository_id, structure_ids=batch).data():
+                        links.append({
+                            "id": record["id"],
+                            "source": repository_id,
+                            "target": record["structure_id"],
+                            "type": "HAS_STRUCTURE",
+                            "properties": {}
+                        })
+
+            for start in range(0, len(replaced_ids), Config.IMPORT_CHUNK_SIZE):
+                batch = replaced_ids[start:start + Config.IMPORT_CHUNK_SIZE]
+                for record in tx.run(delete_query, structure_ids=batch).data():
+                    removed.append(record["structure_id"])
+                    removed.extend(record["face_ids"])
+            return links, removed
+
+        return self.graph.run_in_transaction(finalize)
+
+    @staticmethod
+    def _structure_write_query(labels) -> str:
+
+        labels_str = "".join([f":`{label.replace('`', '')}`" for label in labels])
+        return f"""
+        UNWIND $structures AS s
+        CREATE (n{labels_str}) SET n += s.props, n.import_id = $import_id
+        WITH n, s
+        CALL {{
+            WITH n, s
+            UNWIND s.faces AS face_props
+            CREATE (f:Face) SET f += face_props, f.import_id = $import_id
+            CREATE (n)-[h:HAS_FACE]->(f)
+            RETURN collect(f) AS faces, collect(elementId(h)) AS has_face_ids
+        }}
+        CALL {{
+            WITH s, faces
+            UNWIND s.edges AS edge
+            WITH faces[edge.source] AS a, faces[edge.target] AS b, edge
+            CREATE (a)-[r:RELATIONSHIP]->(b)
+            SET r += edge.props
+            RETURN collect(elementId(r)) AS edge_ids
+        }}
+        RETURN elementId(n) AS id, [f IN faces | elementId(f)] AS face_ids, has_face_ids, edge_ids
+        """
\ No newline at end of file
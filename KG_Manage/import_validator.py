@@ -0,0 +1,205 @@
+import argparse
+import json
+import logging
+import sys
+import time
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Any, Optional
+
+from config import Config
+from KG_Manage.compression import iter_xml_sources
+
+logger = logging.getLogger(__name__)
+
+
+KNOWN_ATTRIBUTES = {
+    "Structure": frozenset(("StructureNo", "StructureName", "StructureEnglishName")),
+    "Face": frozenset(("FaceNo", "FaceType", "OutterLoopSize", "InnerLoopSize", "IsConvexSurface")),
+    "RelationShip": frozenset((
+        "SourceFaceNo", "TargetFaceNo", "IsIntersection", "IsParallel", "IsVertical", "IsConvexity",
+        "SizeEdgeIntersection", "RelationShipType", "FlagAngleDegree"
+    ))
+}
+KNOWN_ATTRIBUTES["Edge"] = KNOWN_ATTRIBUTES["RelationShip"]
+
+STRUCTURE_CHILDREN = {"FaceList": ("Face",), "RelationShipList": ("RelationShip", "Edge"), "EdgeList": ("Edge", "RelationShip")}
+
+
+class ImportValidator:
+
+
+    def __init__(self, max_issues: Optional[int] = None):
+        self.max_issues = Config.IMPORT_VALIDATION_MAX_ISSUES if max_issues is None else max_issues
+
+    def validate(self, source) -> Dict[str, Any]:
+
+        started = time.perf_counter()
+        report = {
+            "valid": True,
+            "structures": 0,
+            "faces": 0,
+            "edges": 0,
+            "errors": 0,
+            "warnings": 0,
+            "issues": [],
+            "truncated": False
+        }
+
+        try:
+            events = ET.iterparse(source, events=("start", "end"))
+            _, root = next(events)
+            if root.tag != "StandardFeatureStructure":
+                self._issue(report, "error", "unsupported_root", f"Unsupported XML format, the root element is: {root.tag}")
+            else:
+                depth = 1
+                for event, elem in events:
+                    if event == "start":
+                        depth += 1
+                        continue
+
+                    depth -= 1
+                    if depth == 1:
+                        if elem.tag == "Structure":
+                            self._check_structure(report, elem)
+                        else:
+                            self._issue(report, "warning", "unknown_element", f"Unknown element <{elem.tag}> under the root")
+                        root.clear()
+
+                if report["structures"] == 0:
+                    self._issue(report, "error", "no_structures", "The file contains no <Structure> elements")
+        except ET.ParseError as e:
+            self._issue(report, "error", "parse_error", f"XML format error: {e}")
+        except StopIteration:
+            self._issue(report, "error", "parse_error", "XML format error: empty document")
+
+        report["valid"] = report["errors"] == 0
+        report["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return report
+
+    def validate_upload(self, raw, filename: str) -> Dict[str, Any]:
+
+        reports = [(name, self.validate(source)) for name, source in iter_xml_sources(raw, filename)]
+        if len(reports) == 1:
+            return reports[0][1]
+
+        combined = {
+            "valid": all(report["valid"] for _, report in reports),
+            "issues": [],
+            "truncated": any(report["truncated"] for _, report in reports),
+            "files": {name: report["valid"] for name, report in reports}
+        }
+        for key in ("structures", "faces", "edges", "errors", "warnings", "elapsed_ms"):
+            combined[key] = sum(report[key] for _, report in reports)
+        combined["elapsed_ms"] = round(combined["elapsed_ms"], 1)
+
+        for name, report in reports:
+            for issue in report["issues"]:
+                if len(combined["issues"]) >= self.max_issues:
+                    combined["truncated"] = True
+                    break
+                combined["issues"].append(dict(issue, file=name))
+        return combined
+
+    def _check_structure(self, report: Dict[str, Any], structure_elem: ET.Element):
+
+        report["structures"] += 1
+        structure_no = structure_elem.get("StructureNo")
+        context = {"structure_no": structure_no}
+
+        self._check_attributes(report, structure_elem, context)
+        if structure_no is None:
+            self._issue(report, "warning", "missing_attribute", "Structure has no StructureNo", context)
+
+        faces = set()
+        edges = []
+        for child in structure_elem:
+            allowed = STRUCTURE_CHILDREN.get(child.tag)
+            if allowed is None:
+                self._issue(report, "warning", "unknown_element", f"Unknown element <{child.tag}> in Structure", context)
+                continue
+
+            for item in child:
+                if item.tag not in allowed:
+                    self._issue(report, "warning", "unknown_element",
+                                f"Unknown element <{item.tag}> in <{child.tag}>", context)
+                    continue
+
+                if item.tag == "Face":
+                    report["faces"] += 1
+                    face_no = item.get("FaceNo")
+                    face_context = dict(context, face_no=face_no)
+                    self._check_attributes(report, item, face_context)
+                    if face_no is None:
+                        self._issue(report, "error", "missing_face_no", "Face has no FaceNo", face_context)
+                    elif face_no in faces:
+                        self._issue(report, "error", "duplicate_face_no", f"Duplicate FaceNo {face_no}", face_context)
+                    else:
+                        faces.add(face_no)
+                else:
+                    report["edges"] += 1
+                    edge = (item.get("SourceFaceNo"), item.get("TargetFaceNo"))
+                    edge_context = dict(context, source_face_no=edge[0], target_face_no=edge[1])
+                    self._check_attributes(report, item, edge_context)
+                    edges.append((edge, edge_context))
+
+        pairs = set()
+        for edge, edge_context in edges:
+            source, target = edge
+            if source not in faces or target not in faces:
+                missing = [no for no in edge if no not in faces]
+                self._issue(report, "error", "dangling_face_reference",
+                            f"Edge references unknown FaceNo {', '.join(str(no) for no in missing)}", edge_context)
+            elif source == target:
+                self._issue(report, "warning", "self_loop", f"Edge {source} -> {target} is a self-loop", edge_context)
+            else:
+                pairs.add(edge)
+
+        for source, target in sorted(pairs):
+            if (target, source) not in pairs:
+                self._issue(report, "warning", "asymmetric_edge", f"Edge {source} -> {target} has no reverse edge",
+                            dict(context, source_face_no=source, target_face_no=target))
+
+    def _check_attributes(self, report: Dict[str, Any], elem: ET.Element, context: Dict[str, Any]):
+
+        known = KNOWN_ATTRIBUTES[elem.tag]
+        for name, value in elem.attrib.items():
+            if name not in known:
+                self._issue(report, "warning", "unknown_attribute", f"Unknown attribute {name} on <{elem.tag}>", context)
+            elif value.strip() == "":
+                self._issue(report, "warning", "empty_attribute", f"Empty attribute {name} on <{elem.tag}>", context)
+
+    def _issue(self, report: Dict[str, Any], severity: str, code: str, message: str,
+               context: Optional[Dict[str, Any]] = None):
+
+        report["errors" if severity == "error" else "warnings"] += 1
+        if len(report["issues"]) >= self.max_issues:
+            report["truncated"] = True
+            return
+
+        issue = {"severity": severity, "code": code, "message": message}
+        if context:
+            issue.update(context)
+        report["issues"].append(issue)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    parser = argparse.ArgumentParser(
+        prog="python -m KG_Manage.import_validator",
+        description="Validate StandardFeatureStructure XML files without touching the database."
+    )
+    parser.add_argument("files", nargs="+", help="StandardFeatureStructure XML files (.xml, .xml.gz, .xml.zst or .zip)")
+    parser.add_argument("--max-issues", type=int, default=None, help="Maximum number of issues listed per file")
+    args = parser.parse_args(argv)
+
+    validator = ImportValidator(args.max_issues)
+    reports = {}
+    for path in args.files:
+        with open(path, "rb") as f:
+            reports[path] = validator.validate_upload(f, path)
+    print(json.dumps(reports, indent=2, ensure_ascii=False))
+    return 0 if all(report["valid"] for report in reports.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
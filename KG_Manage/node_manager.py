@@ -1,4 +1,5 @@
 import logging
+import uuid
 from typing import Dict, List, Any
 
 logger = logging.getLogger(__name__)
@@ -18,6 +19,9 @@ class NodeManager:
 
         try:
 
+            properties = dict(properties)
+            properties.setdefault("uuid", str(uuid.uuid4()))
+
             labels_str = "".join([f":`{label}`" for label in labels])
             query = f"CREATE (n{labels_str}) SET n += $props RETURN elementId(n) AS id"
 
@@ -33,7 +37,7 @@ class NodeManager:
                 "properties": dict(properties)
             }
 
-            self.data_loader.nodes.append(node_data)
+            self.data_loader.add_node(node_data)
             logger.info(f"Created node: {node_id}")
             return node_data
 
@@ -58,7 +62,8 @@ class NodeManager:
 
 
             self.graph.run(
-                "MATCH (n) WHERE elementId(n) = $id SET n = $props",
+                "MATCH (n) WHERE elementId(n) = $id "
+                "WITH n, n.uuid AS uuid SET n = $props, n.uuid = coalesce($props.uuid, uuid)",
                 id=node_id, props=properties
             )
 
@@ -70,11 +75,7 @@ class NodeManager:
                 )
 
 
-            for node in self.data_loader.nodes:
-                if node["id"] == node_id:
-                    node["labels"] = labels
-                    node["properties"] = dict(properties)
-                    break
+            self.data_loader.update_node(node_id, labels, properties)
 
             logger.info(f"Updated node: {node_id}")
             return True
@@ -96,9 +97,7 @@ class NodeManager:
             )
 
 
-            self.data_loader.nodes = [x for x in self.data_loader.nodes if x["id"] != node_id]
-            self.data_loader.rels = [r for r in self.data_loader.rels if
-                                     r["source"] != node_id and r["target"] != node_id]
+            self.data_loader.remove_node(node_id)
 
             logger.info(f"Deleted node: {node_id}")
             return True
@@ -110,7 +109,7 @@ class NodeManager:
     def get_node_labels(self, node_id: str) -> List[str]:
 
         try:
-            cursor = self.graph.run(
+            cursor = self.graph.query(
                 "MATCH (n) WHERE elementId(n) = $id RETURN labels(n) AS labels",
                 id=node_id
             )
@@ -23,13 +23,13 @@ class RelationshipManager:
             logger.info(f"Properties: {properties}")
 
 
-            source_cursor = self.graph.run(
+            source_cursor = self.graph.query(
                 "MATCH (n) WHERE elementId(n) = $id RETURN count(n) as count",
                 id=source_id
             )
             source_record = source_cursor.evaluate()
 
-            target_cursor = self.graph.run(
+            target_cursor = self.graph.query(
                 "MATCH (n) WHERE elementId(n) = $id RETURN count(n) as count",
                 id=target_id
             )
@@ -73,7 +73,7 @@ class RelationshipManager:
                 "properties": dict(properties)
             }
 
-            self.data_loader.rels.append(rel_data)
+            self.data_loader.add_rel(rel_data)
             logger.info(f"Created relationship: {rel_id}")
             return rel_data
 
@@ -114,7 +114,7 @@ class RelationshipManager:
             )
 
 
-            self.data_loader.rels = [x for x in self.data_loader.rels if x["id"] != rel_id]
+            self.data_loader.remove_rel(rel_id)
 
             logger.info(f"Deleted relationship: {rel_id}")
             return True
@@ -0,0 +1,189 @@
+import bisect
+import heapq
+import itertools
+import logging
+import re
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+SCAN_LIMIT = 2000
+
+
+def tokenize(text: str) -> List[str]:
+
+    return _TOKEN_PATTERN.findall(str(text).lower())
+
+
+def display_name(labels, properties: Dict[str, Any]) -> str:
+
+    title = (properties.get("name") or
+             properties.get("english_name") or
+             (labels[0] if labels else "Node"))
+    return str(title)
+
+
+class SearchIndex:
+
+
+    def __init__(self):
+        self._postings = {}
+        self._name_postings = {}
+        self._exact_names = {}
+        self._node_tokens = {}
+        self._names = {}
+        self._sorted_tokens = []
+        self._sorted_dirty = False
+
+    def clear(self):
+
+        self._postings.clear()
+        self._name_postings.clear()
+        self._exact_names.clear()
+        self._node_tokens.clear()
+        self._names.clear()
+        self._sorted_tokens = []
+        self._sorted_dirty = False
+
+    def add(self, node_id: str, labels, properties: Dict[str, Any]):
+
+        if node_id in self._node_tokens:
+            self.remove(node_id)
+
+        tokens = set()
+        for label in labels:
+            tokens.update(tokenize(label))
+        for value in properties.values():
+            if value is None or value == "":
+                continue
+            tokens.update(tokenize(value))
+
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                self._sorted_dirty = True
+            postings.add(node_id)
+
+        name = display_name(labels, properties).lower()
+        for token in tokenize(name):
+            self._name_postings.setdefault(token, set()).add(node_id)
+        self._exact_names.setdefault(name, set()).add(node_id)
+
+        self._node_tokens[node_id] = frozenset(tokens)
+        self._names[node_id] = name
+
+    def remove(self, node_id: str):
+
+        tokens = self._node_tokens.pop(node_id, None)
+        name = self._names.pop(node_id, None)
+        if name is not None:
+            self._discard(self._exact_names, name, node_id)
+            for token in tokenize(name):
+                self._discard(self._name_postings, token, node_id)
+        if not tokens:
+            return
+
+        for token in tokens:
+            self._discard(self._postings, token, node_id)
+
+    def search(self, query: str, limit: int = 10, candidates: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        self._refresh_sorted_tokens()
+
+        prefix_sets = []
+        exact_sets = []
+        name_sets = []
+        for term in terms:
+            expanded = self._expand_prefix(term)
+            if not expanded:
+                return []
+            prefix_sets.append(self._union(self._postings, expanded))
+            exact_sets.append(self._postings.get(term, set()))
+            name_sets.append(self._union(self._name_postings, expanded))
+
+        filters = prefix_sets + ([candidates] if candidates is not None else [])
+        filters.sort(key=len)
+
+        phrase = query.strip().lower()
+        if len(filters[0]) <= SCAN_LIMIT:
+            matches = self._take(filters[0], filters[1:], len(filters[0]))
+        else:
+            matches = set()
+            for source in (self._exact_names.get(phrase, set()), min(name_sets, key=len)):
+                if len(source) <= SCAN_LIMIT:
+                    matches.update(self._take(source, filters, len(source)))
+            matches.update(self._take(min(exact_sets, key=len), filters, limit))
+            matches.update(self._take(filters[0], filters[1:], limit))
+
+        scored = []
+        for node_id in matches:
+            node_tokens = self._node_tokens[node_id]
+            score = 0.0
+            for term in terms:
+                if term in node_tokens:
+                    score += 2.0
+                elif any(token.startswith(term) for token in node_tokens):
+                    score += 1.0
+                else:
+                    score = None
+                    break
+            if score is None:
+                continue
+
+            name = self._names.get(node_id, "")
+            if name == phrase:
+                score += 4.0
+            elif phrase in name:
+                score += 2.0
+            scored.append((score, node_id))
+
+        best = heapq.nlargest(limit, scored, key=lambda item: (item[0], -len(self._names.get(item[1], ""))))
+        return [(node_id, score) for score, node_id in best]
+
+    @staticmethod
+    def _take(source: Set[str], filters: List[Set[str]], count: int) -> List[str]:
+
+        matching = (node_id for node_id in source if all(node_id in f for f in filters))
+        return list(itertools.islice(matching, count))
+
+    @staticmethod
+    def _union(postings: Dict[str, Set[str]], tokens: List[str]) -> Set[str]:
+
+        if len(tokens) == 1:
+            return postings.get(tokens[0], set())
+        return set().union(*(postings.get(token, ()) for token in tokens))
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set[str]], key: str, node_id: str):
+
+        ids = postings.get(key)
+        if ids is None:
+            return
+        ids.discard(node_id)
+        if not ids:
+            del postings[key]
+
+    def _expand_prefix(self, term: str) -> List[str]:
+
+        tokens = []
+        start = bisect.bisect_left(self._sorted_tokens, term)
+        for index in range(start, len(self._sorted_tokens)):
+            token = self._sorted_tokens[index]
+            if not token.startswith(term):
+                break
+            if token in self._postings:
+                tokens.append(token)
+        return tokens
+
+    def _refresh_sorted_tokens(self):
+
+        if self._sorted_dirty:
+            self._sorted_tokens = sorted(self._postings)
+            self._sorted_dirty = False
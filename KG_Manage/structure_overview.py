@@ -0,0 +1,190 @@
+import logging
+from typing import Dict, Any, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class StructureOverview:
+
+
+    def __init__(self, store):
+        self.store = store
+        self._structure_ids = {}
+        self._aggregates = {}
+
+    def clear(self):
+
+        self._structure_ids.clear()
+        self._aggregates.clear()
+
+    def rebuild(self):
+
+        self.clear()
+        for rel_type in ("HAS_STRUCTURE", "HAS_FACE"):
+            for rel in self.store.rels_by_type(rel_type):
+                self._structure_ids[rel.target if rel_type == "HAS_STRUCTURE" else rel.source] = None
+
+
+    def structures_for_node(self, node_id: str, include_neighbors: bool = False) -> Set[str]:
+
+        affected = set()
+        if node_id in self._structure_ids:
+            affected.add(node_id)
+        for has_face in self.store.incoming_records(node_id, "HAS_FACE"):
+            affected.add(has_face.source)
+
+        if include_neighbors:
+            for rel in self.store.outgoing_records(node_id, "RELATIONSHIP"):
+                affected |= self.structures_for_node(rel.target)
+            for rel in self.store.incoming_records(node_id, "RELATIONSHIP"):
+                affected |= self.structures_for_node(rel.source)
+        return affected
+
+    def invalidate(self, structure_ids: Set[str]):
+
+        for structure_id in structure_ids:
+            self._aggregates.pop(structure_id, None)
+
+    def on_node_removed(self, node_id: str, affected: Set[str]):
+
+        self._structure_ids.pop(node_id, None)
+        self.invalidate(affected)
+
+    def on_rel_added(self, rel):
+
+        if rel.type == "HAS_STRUCTURE":
+            self._structure_ids[rel.target] = None
+            self.invalidate({rel.target})
+        elif rel.type == "HAS_FACE":
+            self._structure_ids[rel.source] = None
+            self.invalidate({rel.source})
+        elif rel.type == "RELATIONSHIP":
+            self.invalidate(self.structures_for_node(rel.source) | self.structures_for_node(rel.target))
+
+    def on_rel_removed(self, rel):
+
+        if rel.type == "HAS_STRUCTURE":
+            self.invalidate({rel.target})
+        elif rel.type == "HAS_FACE":
+            self.invalidate({rel.source, rel.target} | self.structures_for_node(rel.target))
+        elif rel.type == "RELATIONSHIP":
+            self.invalidate(self.structures_for_node(rel.source) | self.structures_for_node(rel.target))
+
+
+    def get_overview(self, repository_id: Optional[str] = None) -> Dict[str, Any]:
+
+        if repository_id:
+            repository_ids = [repository_id] if self.store.has_node(repository_id) else []
+            structure_ids = [rel.target for rel in self.store.outgoing_records(repository_id, "HAS_STRUCTURE")]
+        else:
+            repository_ids = self.store.node_ids_by_label("Repository")
+            structure_ids = list(self._structure_ids)
+
+        structures = []
+        for structure_id in structure_ids:
+            aggregate = self.get_structure_aggregate(structure_id)
+            if aggregate is not None:
+                structures.append(aggregate)
+
+        links = []
+        for repo_id in repository_ids:
+            for rel in self.store.outgoing_records(repo_id, "HAS_STRUCTURE"):
+                links.append({
+                    "id": rel.id,
+                    "source": rel.source,
+                    "target": rel.target,
+                    "type": rel.type
+                })
+
+        return {
+            "repositories": [self.store.get_node(repo_id) for repo_id in repository_ids],
+            "structures": structures,
+            "relationships": links,
+            "totals": {
+                "structures": len(structures),
+                "faces": sum(s["face_count"] for s in structures),
+                "edges": sum(s["edge_count"] for s in structures)
+            }
+        }
+
+    def get_structure_aggregate(self, structure_id: str) -> Optional[Dict[str, Any]]:
+
+        aggregate = self._aggregates.get(structure_id)
+        if aggregate is not None:
+            return aggregate
+
+        record = self.store.get_node_record(structure_id)
+        if record is None or structure_id not in self._structure_ids:
+            return None
+
+        face_ids = [rel.target for rel in self.store.outgoing_records(structure_id, "HAS_FACE")]
+        face_set = set(face_ids)
+
+        face_types = {}
+        convex_faces = 0
+        inner_loops = 0
+        edge_count = 0
+        external_edge_count = 0
+
+        for face_id in face_ids:
+            face = self.store.get_node_record(face_id)
+            if face is None:
+                continue
+
+            face_type = str(face.get("face_type", ""))
+            face_types[face_type] = face_types.get(face_type, 0) + 1
+            if str(face.get("is_convex_surface", "0")) == "1":
+                convex_faces += 1
+            try:
+                inner_loops += int(face.get("inner_loop_size") or 0)
+            except (TypeError, ValueError):
+                pass
+
+            for rel in self.store.outgoing_records(face_id, "RELATIONSHIP"):
+                if rel.target in face_set:
+                    edge_count += 1
+                else:
+                    external_edge_count += 1
+
+        aggregate = {
+            "id": structure_id,
+            "labels": list(record.labels),
+            "structure_no": record.get("structure_no"),
+            "structure_name": record.get("structure_name"),
+            "structure_english_name": record.get("structure_english_name"),
+            "repository_ids": [rel.source for rel in self.store.incoming_records(structure_id, "HAS_STRUCTURE")],
+            "face_count": len(face_ids),
+            "edge_count": edge_count,
+            "external_edge_count": external_edge_count,
+            "face_types": face_types,
+            "convex_faces": convex_faces,
+            "inner_loops": inner_loops
+        }
+        self._aggregates[structure_id] = aggregate
+        return aggregate
+
+    def get_structure_detail(self, structure_id: str) -> Optional[Dict[str, Any]]:
+
+        structure = self.store.get_node(structure_id)
+        if structure is None:
+            return None
+
+        has_face_rels = self.store.outgoing_records(structure_id, "HAS_FACE")
+        face_ids = {rel.target for rel in has_face_rels}
+
+        nodes = [structure]
+        relationships = [rel.to_dict() for rel in has_face_rels]
+        for rel in has_face_rels:
+            face = self.store.get_node(rel.target)
+            if face is None:
+                continue
+            nodes.append(face)
+            for face_rel in self.store.outgoing_records(rel.target):
+                if face_rel.target in face_ids:
+                    relationships.append(face_rel.to_dict())
+
+        return {
+            "structure": self.get_structure_aggregate(structure_id),
+            "nodes": nodes,
+            "relationships": relationships
+        }
@@ -1,11 +1,15 @@
-from flask import Flask, render_template, request, jsonify, Response
+from flask import Flask, render_template, request, jsonify, Response, send_file, stream_with_context
 from flask_cors import CORS
 from datetime import datetime
+import hashlib
 import json
 import logging
+import os
 import traceback
 
 from config import Config
+from KG_Manage.compression import (ENCODING_MIMETYPES, ENCODING_SUFFIXES, available_encodings, compress_chunks,
+                                   is_supported_import, resolve_export_format)
 from KG_Manage.graph_editor import Neo4jGraphEditor
 
 logging.basicConfig(level=logging.INFO)
@@ -49,16 +53,143 @@ def get_graph_data():
 
     try:
         if editor.graph:
-            editor.reload_db()
+            if request.args.get('refresh', '').lower() in ('1', 'true'):
+                editor.reload_db()
+            else:
+                editor.ensure_loaded()
+
+        paged = any(key in request.args for key in ('limit', 'cursor', 'label', 'repository_id'))
+
+        etag = editor.get_graph_etag()
+        if paged:
+            etag = f"{etag}-{hashlib.sha1(request.query_string).hexdigest()[:12]}"
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+
+        if paged:
+            limit = request.args.get('limit', Config.GRAPH_PAGE_SIZE, type=int)
+            limit = max(1, min(limit, Config.GRAPH_PAGE_MAX_SIZE))
+            data = editor.get_graph_page(
+                limit,
+                cursor=request.args.get('cursor') or None,
+                label=request.args.get('label') or None,
+                repository_id=request.args.get('repository_id') or None,
+                cumulative=request.args.get('edges', 'window').lower() == 'cumulative'
+            )
+            response = jsonify({
+                "nodes": data["nodes"],
+                "relationships": data["relationships"],
+                "next_cursor": data["next_cursor"],
+                "has_more": data["has_more"],
+                "total": data["total"],
+                "success": True
+            })
+        else:
+            data = editor.get_graph_data()
+            response = jsonify({
+                "nodes": data["nodes"],
+                "relationships": data["relationships"],
+                "success": True
+            })
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    except ValueError as e:
+        return jsonify({
+            "error": str(e),
+            "success": False
+        }), 400
+    except Exception as e:
+        logger.error(f"Error getting graph data: {e}")
+        return jsonify({
+            "error": str(e),
+            "success": False
+        }), 500
+
+
+@app.route('/api/graph/overview', methods=['GET'])
+def get_graph_overview():
+
+    try:
+        if editor.graph:
+            editor.ensure_loaded()
+
+        repository_id = request.args.get('repository_id') or None
+        etag = f"{editor.get_graph_etag()}-overview-{repository_id or ''}"
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+
+        overview = editor.get_structure_overview(repository_id)
+        response = jsonify({
+            "repositories": overview["repositories"],
+            "structures": overview["structures"],
+            "relationships": overview["relationships"],
+            "totals": overview["totals"],
+            "success": True
+        })
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    except Exception as e:
+        logger.error(f"Error getting graph overview: {e}")
+        return jsonify({
+            "error": str(e),
+            "success": False
+        }), 500
+
+
+@app.route('/api/graph/structures/<structure_id>', methods=['GET'])
+def get_structure_detail(structure_id):
+
+    try:
+        if editor.graph:
+            editor.ensure_loaded()
+
+        detail = editor.get_structure_detail(structure_id)
+        if detail is None:
+            return jsonify({
+                "error": f"Structure not found: {structure_id}",
+                "success": False
+            }), 404
 
-        data = editor.get_graph_data()
         return jsonify({
-            "nodes": data["nodes"],
-            "relationships": data["relationships"],
+            "structure": detail["structure"],
+            "nodes": detail["nodes"],
+            "relationships": detail["relationships"],
             "success": True
         })
     except Exception as e:
-        logger.error(f"Error getting graph data: {e}")
+        logger.error(f"Error getting structure detail: {e}")
+        return jsonify({
+            "error": str(e),
+            "success": False
+        }), 500
+
+
+@app.route('/api/search', methods=['GET'])
+def search_nodes():
+
+    try:
+        if editor.graph:
+            editor.ensure_loaded()
+
+        query = request.args.get('q', '').strip()
+        limit = request.args.get('limit', 10, type=int)
+        limit = max(1, min(limit, Config.SEARCH_MAX_RESULTS))
+        labels = [l.strip() for l in request.args.get('label', '').split(',') if l.strip()]
+
+        results = editor.search_nodes(query, limit, labels or None) if query else []
+        return jsonify({
+            "query": query,
+            "results": results,
+            "success": True
+        })
+    except Exception as e:
+        logger.error(f"Error searching nodes: {e}")
         return jsonify({
             "error": str(e),
             "success": False
@@ -68,6 +199,8 @@ def get_graph_data():
 @app.route('/api/labels', methods=['GET'])
 def get_labels():
     try:
+        if editor.graph:
+            editor.ensure_loaded()
         labels = editor.get_available_labels()
         return jsonify({
             "success": True,
@@ -140,11 +273,7 @@ def update_node(node_id):
 
         editor.update_node(node_id, labels, properties)
 
-        updated_node = None
-        for node in editor.nodes:
-            if node["id"] == node_id:
-                updated_node = node
-                break
+        updated_node = editor.get_node(node_id)
 
         return jsonify({
             "node": updated_node,
@@ -275,26 +404,72 @@ def delete_relationship(rel_id):
 
 
 
+def export_encoding(export_format):
+
+    export_format = (export_format or 'xml').lower()
+    if export_format == 'xml':
+        return request.accept_encodings.best_match(available_encodings()), False
+    return resolve_export_format(export_format), True
+
+
+def export_artifact_response(artifact, filename, explicit=False):
+
+    encoding = artifact["encoding"]
+    mimetype = 'application/xml'
+    if encoding and explicit:
+        mimetype = ENCODING_MIMETYPES[encoding]
+        filename += ENCODING_SUFFIXES[encoding]
+
+    etag = artifact["etag"]
+    if etag and request.if_none_match.contains(etag):
+        if artifact["file"]:
+            artifact["file"].close()
+        response = Response(status=304)
+        response.set_etag(etag)
+        response.vary.add('Accept-Encoding')
+        return response
+
+    if artifact["file"]:
+        response = send_file(
+            artifact["file"],
+            mimetype=mimetype,
+            as_attachment=True,
+            download_name=filename,
+            etag=etag,
+            max_age=None
+        )
+        response.content_length = os.fstat(artifact["file"].fileno()).st_size
+    else:
+        response = Response(
+            stream_with_context(artifact["stream"]),
+            mimetype=mimetype,
+            headers={
+                'Content-Disposition': f'attachment; filename={filename}'
+            }
+        )
+        if etag:
+            response.set_etag(etag)
+
+    if encoding and not explicit:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
 @app.route('/api/export', methods=['GET'])
 def export_graph():
     try:
-        format_type = request.args.get('format', 'xml').lower()
-
-        if format_type == 'xml':
-            xml_content = editor.export_to_xml()
-            return Response(
-                xml_content,
-                mimetype='application/xml',
-                headers={
-                    'Content-Disposition': f'attachment; filename=neo4j_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xml'
-                }
-            )
-        else:
-            return jsonify({
-                "error": "Only supports XML format export",
-                "success": False
-            }), 400
+        encoding, explicit = export_encoding(request.args.get('format'))
+        artifact = editor.export_xml_artifact("full", encoding=encoding)
+        return export_artifact_response(
+            artifact, f'neo4j_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xml', explicit)
 
+    except ValueError as e:
+        return jsonify({
+            "error": str(e),
+            "success": False
+        }), 400
     except Exception as e:
         logger.error(f"Error exporting data: {e}")
         return jsonify({
@@ -303,19 +478,53 @@ def export_graph():
         }), 500
 
 
-@app.route('/api/export/xml/full', methods=['GET'])
-def export_full_xml():
+@app.route('/api/export/ndjson', methods=['GET'])
+def export_ndjson():
     try:
-        xml_content = editor.export_to_xml()
+        if not editor.graph:
+            return jsonify({
+                "error": "Database not connected",
+                "success": False
+            }), 503
 
-        return Response(
-            xml_content,
-            mimetype='application/xml',
+        encoding = request.accept_encodings.best_match(available_encodings())
+        stream = editor.export_ndjson()
+        if encoding:
+            stream = compress_chunks(stream, encoding)
+
+        response = Response(
+            stream_with_context(stream),
+            mimetype='application/x-ndjson',
             headers={
-                'Content-Disposition': f'attachment; filename=neo4j_full_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xml'
+                'Content-Disposition': f'attachment; filename=neo4j_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.ndjson'
             }
         )
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+
+    except Exception as e:
+        logger.error(f"NDJSON export failed: {e}")
+        return jsonify({
+            "error": str(e),
+            "success": False
+        }), 500
+
+
+@app.route('/api/export/xml/full', methods=['GET'])
+def export_full_xml():
+    try:
+        encoding, explicit = export_encoding(request.args.get('format'))
+        artifact = editor.export_xml_artifact("full", encoding=encoding)
+        return export_artifact_response(
+            artifact, f'neo4j_full_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xml', explicit)
 
+    except ValueError as e:
+        return jsonify({
+            "error": str(e),
+            "success": False
+        }), 400
     except Exception as e:
         logger.error(f"Full XML export failed: {e}")
         return jsonify({
@@ -338,16 +547,16 @@ def export_selective_xml():
                 "success": False
             }), 400
 
-        xml_content = editor.selective_export_xml(selected_labels, repository_id)
-
-        return Response(
-            xml_content,
-            mimetype='application/xml',
-            headers={
-                'Content-Disposition': f'attachment; filename=selective_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xml'
-            }
-        )
+        encoding, explicit = export_encoding(data.get('format'))
+        artifact = editor.export_xml_artifact("selective", selected_labels, repository_id, encoding)
+        return export_artifact_response(
+            artifact, f'selective_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xml', explicit)
 
+    except ValueError as e:
+        return jsonify({
+            "error": str(e),
+            "success": False
+        }), 400
     except Exception as e:
         logger.error(f"Selective XML export fails: {e}")
         return jsonify({
@@ -369,16 +578,16 @@ def export_xml():
                 "success": False
             }), 400
 
-        xml_content = editor.selective_export_xml(selected_labels)
-
-        return Response(
-            xml_content,
-            mimetype='application/xml',
-            headers={
-                'Content-Disposition': f'attachment; filename=feature_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xml'
-            }
-        )
+        encoding, explicit = export_encoding(data.get('format'))
+        artifact = editor.export_xml_artifact("selective", selected_labels, encoding=encoding)
+        return export_artifact_response(
+            artifact, f'feature_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xml', explicit)
 
+    except ValueError as e:
+        return jsonify({
+            "error": str(e),
+            "success": False
+        }), 400
     except Exception as e:
         logger.error(f"XML export failed: {e}")
         return jsonify({
@@ -395,6 +604,7 @@ def import_graph():
         if 'file' in request.files:
             file = request.files['file']
             repository_name = request.form.get('repository_name', '').strip()
+            replace_existing = request.form.get('replace_existing', '').lower() == 'true'
 
             if file.filename == '':
                 return jsonify({
@@ -408,12 +618,19 @@ def import_graph():
                     "success": False
                 }), 400
 
-            filename = file.filename.lower()
-
             try:
-                if filename.endswith('.xml'):
-                    xml_content = file.read().decode('utf-8')
-                    result = editor.import_from_xml(xml_content, repository_name)
+                if is_supported_import(file.filename):
+                    if Config.IMPORT_VALIDATE:
+                        report = editor.validate_import_upload(file.stream, file.filename)
+                        if not report["valid"]:
+                            return jsonify({
+                                "error": f"XML validation failed: {report['errors']} errors",
+                                "success": False,
+                                "validation": report
+                            }), 400
+                        file.stream.seek(0)
+
+                    result = editor.import_from_upload(file.stream, file.filename, repository_name, replace_existing)
 
                     return jsonify({
                         "success": True,
@@ -422,7 +639,7 @@ def import_graph():
                     })
                 else:
                     return jsonify({
-                        "error": "Unsupported file format, please upload an XML file",
+                        "error": "Unsupported file format, please upload .xml, .xml.gz, .xml.zst or .zip",
                         "success": False
                     }), 400
 
@@ -450,6 +667,112 @@ def import_graph():
         }), 500
 
 
+@app.route('/api/import/validate', methods=['POST'])
+def validate_import():
+    file = request.files.get('file')
+    if file is None or file.filename == '':
+        return jsonify({
+            "error": "Please upload a file",
+            "success": False
+        }), 400
+
+    try:
+        report = editor.validate_import_upload(file.stream, file.filename)
+        return jsonify({
+            "success": True,
+            "report": report
+        })
+    except Exception as e:
+        logger.error(f"Import validation failed: {e}")
+        return jsonify({
+            "error": str(e),
+            "success": False
+        }), 500
+
+
+@app.route('/api/import/jobs', methods=['POST'])
+def submit_import_job():
+    try:
+        if not editor.graph:
+            return jsonify({
+                "error": "Database not connected",
+                "success": False
+            }), 503
+
+        file = request.files.get('file')
+        repository_name = request.form.get('repository_name', '').strip()
+        replace_existing = request.form.get('replace_existing', '').lower() == 'true'
+
+        if file is None or file.filename == '':
+            return jsonify({
+                "error": "Please upload a file",
+                "success": False
+            }), 400
+
+        if not repository_name:
+            return jsonify({
+                "error": "Please provide a repository name",
+                "success": False
+            }), 400
+
+        if not is_supported_import(file.filename):
+            return jsonify({
+                "error": "Unsupported file format, please upload .xml, .xml.gz, .xml.zst or .zip",
+                "success": False
+            }), 400
+
+        job = editor.submit_import_job(file.stream, file.filename, repository_name, replace_existing)
+        return jsonify({
+            "success": True,
+            "job": job
+        }), 202
+
+    except Exception as e:
+        logger.error(f"Failed to submit import job: {e}")
+        return jsonify({
+            "error": str(e),
+            "success": False
+        }), 500
+
+
+@app.route('/api/import/jobs', methods=['GET'])
+def list_import_jobs():
+    return jsonify({
+        "success": True,
+        "jobs": editor.list_import_jobs()
+    })
+
+
+@app.route('/api/import/jobs/<job_id>', methods=['GET'])
+def get_import_job(job_id):
+    job = editor.get_import_job(job_id)
+    if job is None:
+        return jsonify({
+            "error": "Import job not found",
+            "success": False
+        }), 404
+
+    return jsonify({
+        "success": True,
+        "job": job
+    })
+
+
+@app.route('/api/import/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_import_job(job_id):
+    job = editor.cancel_import_job(job_id)
+    if job is None:
+        return jsonify({
+            "error": "Import job not found",
+            "success": False
+        }), 404
+
+    return jsonify({
+        "success": True,
+        "job": job
+    })
+
+
 @app.route('/api/repositories', methods=['GET'])
 def get_repositories():
     try:
@@ -469,6 +792,8 @@ def get_repositories():
 @app.route('/api/repositories/<repository_id>/structures', methods=['GET'])
 def get_repository_structures(repository_id):
     try:
+        if editor.graph:
+            editor.ensure_loaded()
         structures = editor.get_structures_by_repository(repository_id)
         return jsonify({
             "success": True,
@@ -0,0 +1,125 @@
+import argparse
+import random
+import sys
+import time
+from typing import Dict, List, Any, Optional
+
+from KG_Manage.export_manager import StructureXmlWriter, assemble_structures
+
+
+def make_rows(faces: int, edges: int, seed: int = 7) -> List[Dict[str, Any]]:
+
+    rng = random.Random(seed)
+    face_props = [{
+        "face_no": str(i),
+        "face_type": rng.choice(("Plane", "Cylinder", "Cone")),
+        "outter_loop_size": str(rng.randint(3, 12)),
+        "inner_loop_size": rng.choice((None, "1", "2")),
+        "is_convex_surface": rng.choice(("True", "False")),
+        "structure_name": "Benchmark"
+    } for i in range(1, faces + 1)]
+
+    rows = []
+    for _ in range(edges):
+        source, target = rng.sample(face_props, 2)
+        rows.append({
+            "label": "Benchmark",
+            "structure_no": "1",
+            "source": source,
+            "target": target,
+            "edge": {
+                "is_intersection": "True",
+                "is_parallel": "False",
+                "is_vertical": rng.choice(("True", "False")),
+                "is_convexity": rng.choice(("True", "False")),
+                "size_edge_intersection": str(rng.randint(1, 4)),
+                "relationship_type": "Adjacent",
+                "flag_angle_degree": str(rng.choice((90, 180, 270)))
+            }
+        })
+    return rows
+
+
+def legacy_assemble(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+
+    structure = {"FaceList": [], "RelationShipList": []}
+    for record in rows:
+        n = record["source"]
+        f = record["target"]
+        r = record["edge"]
+        for face in (n, f):
+            face_info = {
+                "FaceNo": face.get("face_no"),
+                "FaceType": face.get("face_type"),
+                "OutterLoopSize": face.get("outter_loop_size"),
+                "InnerLoopSize": face.get("inner_loop_size"),
+                "IsConvexSurface": face.get("is_convex_surface")
+            }
+            if face_info not in structure["FaceList"]:
+                structure["FaceList"].append(face_info)
+        structure["RelationShipList"].append({
+            "SourceFaceNo": n.get("face_no"),
+            "TargetFaceNo": f.get("face_no"),
+            "IsIntersection": r.get("is_intersection"),
+            "IsParallel": r.get("is_parallel"),
+            "IsVertical": r.get("is_vertical"),
+            "IsConvexity": r.get("is_convexity"),
+            "SizeEdgeIntersection": r.get("size_edge_intersection"),
+            "RelationShipType": r.get("relationship_type"),
+            "FlagAngleDegree": r.get("flag_angle_degree")
+        })
+    return structure
+
+
+def best_of(repeat: int, work) -> float:
+
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        work()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.structure_assembly",
+        description="Measure ExportManager structure assembly and XML rendering cost as edges grow."
+    )
+    parser.add_argument("--faces", type=int, nargs="+", default=[100, 200, 400, 800, 1600],
+                        help="Faces per structure to measure")
+    parser.add_argument("--edges-per-face", type=int, default=20, help="Edges generated for every face")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement, the best one is reported")
+    parser.add_argument("--no-legacy", action="store_true", help="Skip the list-scan baseline")
+    args = parser.parse_args(argv)
+
+    writer = StructureXmlWriter("  ", False, "RelationShipList", "RelationShip")
+
+    print(f"{'faces':>6} {'edges':>7} {'assemble ms':>12} {'ns/edge':>8} {'+xml ms':>9} {'ns/edge':>8}"
+          f" {'legacy ms':>10} {'ns/edge':>8}")
+    for faces in args.faces:
+        edges = faces * args.edges_per_face
+        rows = make_rows(faces, edges)
+
+        def assemble():
+            for structure in assemble_structures(rows):
+                structure.sorted_faces()
+
+        def assemble_and_render():
+            for structure in assemble_structures(rows):
+                writer.structure(structure)
+
+        assembled = best_of(args.repeat, assemble)
+        rendered = best_of(args.repeat, assemble_and_render)
+        line = (f"{faces:>6} {edges:>7} {assembled * 1000:>12.1f} {assembled / edges * 1e9:>8.0f}"
+                f" {rendered * 1000:>9.1f} {rendered / edges * 1e9:>8.0f}")
+        if not args.no_legacy:
+            legacy = best_of(args.repeat, lambda: legacy_assemble(rows))
+            line += f" {legacy * 1000:>10.1f} {legacy / edges * 1e9:>8.0f}"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
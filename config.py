@@ -19,6 +19,39 @@ class Config:
     NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
     NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
     NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "your_password_here")
+    NEO4J_BOOTSTRAP_SCHEMA = os.getenv("NEO4J_BOOTSTRAP_SCHEMA", "true").lower() == "true"
+    SCHEMA_BACKFILL_BATCH_SIZE = int(os.getenv("SCHEMA_BACKFILL_BATCH_SIZE", "10000"))
+    NEO4J_POOL_SIZE = int(os.getenv("NEO4J_POOL_SIZE", "20"))
+    NEO4J_ACQUIRE_TIMEOUT = float(os.getenv("NEO4J_ACQUIRE_TIMEOUT", "30"))
+    NEO4J_MAX_RETRIES = int(os.getenv("NEO4J_MAX_RETRIES", "3"))
+    NEO4J_RETRY_BACKOFF = float(os.getenv("NEO4J_RETRY_BACKOFF", "0.2"))
+    NEO4J_HEALTH_CHECK_INTERVAL = float(os.getenv("NEO4J_HEALTH_CHECK_INTERVAL", "30"))
+
+
+    GRAPH_PAGE_SIZE = int(os.getenv("GRAPH_PAGE_SIZE", "500"))
+    GRAPH_PAGE_MAX_SIZE = int(os.getenv("GRAPH_PAGE_MAX_SIZE", "5000"))
+    SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", "100"))
+
+
+    IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "200"))
+    IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "5000"))
+    IMPORT_ROLLBACK_BATCH_SIZE = int(os.getenv("IMPORT_ROLLBACK_BATCH_SIZE", "10000"))
+    IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", "4"))
+    IMPORT_JOB_WORKERS = int(os.getenv("IMPORT_JOB_WORKERS", "1"))
+    IMPORT_JOB_HISTORY = int(os.getenv("IMPORT_JOB_HISTORY", "50"))
+    IMPORT_UPLOAD_DIR = os.getenv("IMPORT_UPLOAD_DIR") or None
+    IMPORT_VALIDATE = os.getenv("IMPORT_VALIDATE", "true").lower() == "true"
+    IMPORT_VALIDATION_MAX_ISSUES = int(os.getenv("IMPORT_VALIDATION_MAX_ISSUES", "1000"))
+
+
+    EXPORT_CACHE_ENABLED = os.getenv("EXPORT_CACHE_ENABLED", "true").lower() == "true"
+    EXPORT_CACHE_DIR = os.getenv("EXPORT_CACHE_DIR") or None
+    EXPORT_CACHE_MAX_BYTES = int(os.getenv("EXPORT_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+    EXPORT_CACHE_MAX_ENTRIES = int(os.getenv("EXPORT_CACHE_MAX_ENTRIES", "64"))
+    EXPORT_GZIP_LEVEL = int(os.getenv("EXPORT_GZIP_LEVEL", "6"))
+    EXPORT_ZSTD_LEVEL = int(os.getenv("EXPORT_ZSTD_LEVEL", "3"))
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+    EXPORT_STRUCTURE_BATCH_SIZE = int(os.getenv("EXPORT_STRUCTURE_BATCH_SIZE", "50"))
 
 
     COLOR_PALETTE = [
@@ -0,0 +1,165 @@
+import copy
+import itertools
+import re
+
+import pytest
+
+from KG_Manage.export_manager import ExportManager
+from KG_Manage.import_manager import ImportManager
+
+
+UNIQUE_UUID_LABELS = ("Face", "Repository")
+
+
+class Records(list):
+
+    def data(self):
+
+        return list(self)
+
+
+class MemoryGraph:
+
+
+    def __init__(self):
+        self.nodes = {}
+        self.rels = {}
+        self._ids = itertools.count()
+
+    def __bool__(self):
+
+        return True
+
+    def run_in_transaction(self, work):
+
+        snapshot = copy.deepcopy((self.nodes, self.rels))
+        try:
+            return work(self)
+        except Exception:
+            self.nodes, self.rels = snapshot
+            raise
+
+    def run(self, query, parameters=None, **kwparameters):
+
+        if "CREATE (m" in query:
+            labels = re.search(r"CREATE \(m((?::`[^`]+`)+):_ImportBatch\)", query).group(1)
+            labels = re.findall(r"`([^`]+)`", labels)
+            created = []
+            for row in kwparameters["rows"]:
+                node_id = f"4:test:{next(self._ids)}"
+                props = dict(row["props"], _import_key=row["key"])
+                self._check_unique(labels, props)
+                self.nodes[node_id] = {"labels": labels + ["_ImportBatch"], "props": props}
+                created.append({"id": node_id})
+            return Records(created)
+
+        if "CREATE (x)-[rel:" in query:
+            rel_type = re.search(r"\[rel:`([^`]+)`\]", query).group(1)
+            created = []
+            for row in kwparameters["rows"]:
+                source = self._by_import_key(row["source"])
+                target = self._by_import_key(row["target"])
+                rel_id = f"5:test:{next(self._ids)}"
+                self.rels[rel_id] = {"source": source, "target": target, "type": rel_type, "props": dict(row["props"])}
+                created.append({"index": row["index"], "id": rel_id, "source": source, "target": target})
+            return Records(created)
+
+        if "MATCH (n:_ImportBatch" in query:
+            for key in kwparameters["keys"]:
+                node_id = self._by_import_key(key)
+                if "DETACH DELETE" in query:
+                    del self.nodes[node_id]
+                else:
+                    node = self.nodes[node_id]
+                    node["labels"].remove("_ImportBatch")
+                    node["props"].pop("_import_key")
+            return Records()
+
+        raise AssertionError(f"Unexpected query: {query}")
+
+    def _check_unique(self, labels, props):
+
+        for label in UNIQUE_UUID_LABELS:
+            if label not in labels or props.get("uuid") is None:
+                continue
+            for node in self.nodes.values():
+                if label in node["labels"] and node["props"].get("uuid") == props["uuid"]:
+                    raise Exception(f"Node already exists with label `{label}` and property `uuid` = '{props['uuid']}'")
+
+    def _by_import_key(self, key):
+
+        return next(node_id for node_id, node in self.nodes.items() if node["props"].get("_import_key") == key)
+
+
+class MemoryDataLoader:
+
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    @property
+    def nodes(self):
+
+        return [{"id": node_id, "labels": list(node["labels"]), "properties": dict(node["props"])}
+                for node_id, node in self.graph.nodes.items()]
+
+    @property
+    def rels(self):
+
+        return [{"id": rel_id, "source": rel["source"], "target": rel["target"], "type": rel["type"],
+                 "properties": dict(rel["props"])}
+                for rel_id, rel in self.graph.rels.items()]
+
+    def apply_delta(self, delta):
+
+        return True
+
+
+SOURCE_DATA = {
+    "nodes": [
+        {"id": "r1", "labels": ["Repository"], "properties": {"name": "Rules", "uuid": "repo-uuid"}},
+        {"id": "s1", "labels": ["Slot"], "properties": {"structure_no": "1", "structure_english_name": "Slot"}},
+        {"id": "f1", "labels": ["Face"], "properties": {"face_no": "1", "structure_english_name": "Slot",
+                                                        "uuid": "face-uuid-1"}},
+        {"id": "f2", "labels": ["Face"], "properties": {"face_no": "2", "structure_english_name": "Slot",
+                                                        "uuid": "face-uuid-2"}}
+    ],
+    "relationships": [
+        {"source": "r1", "target": "s1", "type": "HAS_STRUCTURE"},
+        {"source": "s1", "target": "f1", "type": "HAS_FACE"},
+        {"source": "s1", "target": "f2", "type": "HAS_FACE"},
+        {"source": "f1", "target": "f2", "type": "RELATIONSHIP", "properties": {"is_parallel": "True"}}
+    ]
+}
+
+
+@pytest.fixture
+def graph():
+
+    graph = MemoryGraph()
+    ImportManager(graph, MemoryDataLoader(graph)).import_data(SOURCE_DATA)
+    return graph
+
+
+def test_import_assigns_fresh_uuids(graph):
+
+    uuids = [node["props"]["uuid"] for node in graph.nodes.values()]
+    assert len(uuids) == 4
+    assert len(set(uuids)) == 4
+    assert not {"repo-uuid", "face-uuid-1", "face-uuid-2"} & set(uuids)
+
+
+def test_reimport_export_into_populated_database(graph):
+
+    data_loader = MemoryDataLoader(graph)
+    exported = ExportManager(graph, data_loader).export_data()
+    original_uuids = {node["properties"]["uuid"] for node in exported["nodes"]}
+
+    assert ImportManager(graph, data_loader).import_data(exported) is True
+
+    assert len(graph.nodes) == 8
+    assert len(graph.rels) == 8
+    uuids = [node["props"]["uuid"] for node in graph.nodes.values()]
+    assert len(set(uuids)) == 8
+    assert original_uuids < set(uuids)
+    assert all("_ImportBatch" not in node["labels"] for node in graph.nodes.values())